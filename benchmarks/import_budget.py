@@ -0,0 +1,75 @@
+# benchmarks/import_budget.py
+"""
+Import-time budget check for the CLI subcommands.
+
+Each subcommand's entry points are imported in a fresh interpreter, as a
+cold start would, and the wall time is compared with its budget. Heavy
+libraries that a command should only load when it actually uses them are
+reported as violations too. Exits non-zero on any failure, so it can gate
+CI or a container build:
+
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --scale 2   # slower machines
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (subcommand arguments, budget in seconds). dashboard-warm has no budget: the
+# work it defers is importing src.dashboard, which needs Streamlit and pandas
+# as soon as it runs, so only timing its entry module would measure nothing.
+BUDGETS = [
+    (["fetch"], 0.5),
+    (["process"], 0.5),
+    (["load"], 0.5),
+    (["run", "--mode", "streaming"], 0.75),
+    (["run", "--mode", "sequential"], 0.75),
+    (["run", "--worker"], 0.75),
+]
+
+# Libraries no entry point may import up front; they load on first use
+DEFERRED_MODULES = ("openai", "pandas", "boto3", "scipy", "numpy", "pyarrow", "streamlit")
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+main.import_command({command!r}, mode={mode!r}, worker={worker!r})
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "modules": sorted(m for m in sys.modules if "." not in m)}}))
+"""
+
+def measure(args: List[str]) -> Dict:
+    """Import one subcommand in a fresh interpreter and report time and top-level modules"""
+    command = args[0]
+    mode = args[args.index("--mode") + 1] if "--mode" in args else "streaming"
+    probe = _PROBE.format(command=command, mode=mode, worker="--worker" in args)
+    output = subprocess.check_output([sys.executable, "-c", probe], cwd=REPO_ROOT, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check CLI subcommand import times against their budgets")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per subcommand; the fastest counts")
+    args = parser.parse_args()
+
+    failures = 0
+    for command_args, budget in BUDGETS:
+        budget *= args.scale
+        runs = [measure(command_args) for _ in range(max(1, args.repeat))]
+        seconds = min(run["seconds"] for run in runs)
+        loaded = [name for name in DEFERRED_MODULES if name in runs[0]["modules"]]
+        ok = seconds <= budget and not loaded
+        failures += not ok
+        note = f"  imports {', '.join(loaded)}" if loaded else ""
+        print(f"{' '.join(command_args):<26} {seconds:>7.3f}s / {budget:.2f}s  {'ok' if ok else 'OVER'}{note}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
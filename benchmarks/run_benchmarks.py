@@ -0,0 +1,224 @@
+# benchmarks/run_benchmarks.py
+"""
+Offline benchmark suite for the ETL pipeline.
+
+Runs fetch, process, load and dashboard queries against local stand-ins:
+an in-memory S3, a stub HTTP server for RapidAPI and OpenAI, and a local
+Postgres named by the usual DB_* variables. Example:
+
+    DB_HOST=localhost DB_NAME=bench DB_USER=postgres DB_PASS=postgres DB_PORT=5432 DB_SSLMODE=disable \\
+        python -m benchmarks.run_benchmarks --sizes 1000 10000 100000
+
+Results are written as JSON; pass --compare to diff against an earlier run.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.stubs import InMemoryS3, StubServer, reset_database
+from benchmarks.synthetic import generate_payload
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+def _configure_environment(server: StubServer) -> None:
+    """Point the pipeline's configuration at the local stand-ins before it is imported"""
+    os.environ.setdefault("RAPIDAPI_KEY", "benchmark")
+    os.environ.setdefault("AWS_BUCKET_NAME", "benchmark-bucket")
+    os.environ["OPENAI_KEY"] = "benchmark"
+    os.environ["OPENAI_BASE_URL"] = f"{server.base_url}/v1"
+    os.environ.setdefault("METRICS_DIR", os.path.join(RESULTS_DIR, "metrics"))
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+class BenchmarkSuite:
+    """Times each pipeline step at each listing count"""
+
+    def __init__(self, server: StubServer, args: argparse.Namespace):
+        # Imported here so configuration picks up the stand-in environment
+        from src.clients import s3_client
+        from src.jobs import fetch_jobs
+        self.server = server
+        self.args = args
+        self.results: List[Dict] = []
+        self.s3 = InMemoryS3()
+        s3_client._client = self.s3
+        fetch_jobs.API_BASE_URL = f"{server.base_url}/search"
+        self.db_available = not args.skip_db and self._check_db()
+
+    def _check_db(self) -> bool:
+        from src.clients.postgres_client import PostgresClient
+        try:
+            conn = PostgresClient.get_connection()
+            PostgresClient.release_connection(conn)
+            return True
+        except Exception as e:
+            print(f"Postgres unavailable, skipping database cases: {e}", file=sys.stderr)
+            return False
+
+    def _reset_db(self) -> None:
+        """Start each size from an empty, unpartitioned job_data"""
+        from src.clients.postgres_client import PostgresClient
+        from src.jobs.loaders import partitions, schema, search_index, typeahead
+        conn = PostgresClient.get_connection()
+        try:
+            reset_database(conn)
+        finally:
+            PostgresClient.release_connection(conn)
+        partitions._migrated = False
+        schema._schema_ready = False
+        search_index._schema_ready = False
+        typeahead._schema_ready = False
+
+    def record(self, case: str, size: int, func: Callable, records: Optional[int] = None):
+        """Run func once, store its wall time and throughput, and return its result"""
+        from src.utils.metrics import metrics
+        metrics.reset()
+        started = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - started
+        records = size if records is None else records
+        entry = {
+            "case": case,
+            "size": size,
+            "seconds": round(seconds, 4),
+            "records_per_second": round(records / seconds, 1) if seconds else None,
+            "metrics": metrics.summary(),
+        }
+        self.results.append(entry)
+        print(f"{case:<28} {size:>8} {seconds:>10.3f}s {entry['records_per_second'] or 0:>12.1f}/s")
+        return result
+
+    def run_size(self, size: int) -> None:
+        from src.ai import openai_processor
+        from src.jobs.fetch_jobs import main_fetch
+        from src.jobs.process_jobs import process_jobs
+        from src.jobs.processors.data_processor import process_processed_file
+        from src.jobs.load_to_postgresql import update_database
+
+        payload = generate_payload(
+            size,
+            duplication_rate=self.args.duplication_rate,
+            description_words=self.args.description_words,
+        )
+        self.server.payload = payload
+        self.s3.__init__()
+        openai_processor.simplification_cache.clear()
+
+        if self.db_available:
+            self._reset_db()
+        # Without Postgres the scheduler treats every query as due
+        if self.record("main_fetch", size, main_fetch) is None:
+            # Query statistics kept from an earlier size can leave nothing due; seed the raw file directly
+            self.s3.put_object(Bucket="", Key="raw_data/jobs_benchmark.json", Body=json.dumps(payload).encode("utf-8"))
+
+        self.record("process_jobs", size, process_jobs)
+
+        processed = self.s3.list_objects_v2(Bucket="", Prefix="processed_data/").get("Contents", [])
+        files = [(obj["Key"], self.s3.get_object(Bucket="", Key=obj["Key"])["Body"].read()) for obj in processed]
+        print(f"{'processed file bytes':<28} {size:>8} {sum(len(data) for _, data in files):>11}")
+        rows = self.record("read_processed_files", size, lambda: [r for key, data in files for r in process_processed_file(key, data)])
+
+        if not self.db_available:
+            return
+        self.record("update_database", size, lambda: update_database(rows), records=len(rows))
+        self._bench_dashboard(size)
+
+    def _bench_dashboard(self, size: int) -> None:
+        """Time cold dashboard queries against the freshly loaded table"""
+        try:
+            from src import dashboard
+        except ImportError as e:
+            print(f"Dashboard dependencies missing, skipping dashboard cases: {e}", file=sys.stderr)
+            return
+
+        cases = {
+            "dashboard_first_page": lambda: dashboard.fetch_jobs({}),
+            "dashboard_count": lambda: dashboard.count_jobs({}),
+            "dashboard_keyword_search": lambda: dashboard.fetch_jobs({"search_query": "spark pipelines"}),
+            "dashboard_salary_filter": lambda: dashboard.fetch_jobs({"min_salary": 150000}),
+            "dashboard_location_typeahead": lambda: dashboard.suggest_locations("San"),
+        }
+        for case, query in cases.items():
+            dashboard.get_query_cache().invalidate()
+            self.record(case, size, query, records=1)
+
+    def run(self) -> Dict:
+        for size in self.args.sizes:
+            self.run_size(size)
+        return {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "config": {
+                "sizes": self.args.sizes,
+                "duplication_rate": self.args.duplication_rate,
+                "description_words": self.args.description_words,
+                "openai_latency": self.args.openai_latency,
+                "rate_limit_rate": self.args.rate_limit_rate,
+                "database": self.db_available,
+            },
+            "stub_requests": dict(self.server.requests),
+            "results": self.results,
+        }
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> int:
+    """Print per-case timing changes; return how many regressed beyond threshold"""
+    previous = {(r["case"], r["size"]): r["seconds"] for r in baseline["results"]}
+    regressions = 0
+    print(f"\nComparison against {baseline.get('git_commit') or 'baseline'} (threshold {threshold:.0%})")
+    for result in current["results"]:
+        before = previous.get((result["case"], result["size"]))
+        if not before:
+            continue
+        change = (result["seconds"] - before) / before
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{result['case']:<28} {result['size']:>8} {before:>9.3f}s -> {result['seconds']:>9.3f}s {change:>+8.1%}{flag}")
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline ETL pipeline benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--duplication-rate", type=float, default=0.1)
+    parser.add_argument("--description-words", type=int, default=300)
+    parser.add_argument("--openai-latency", type=float, default=0.05, help="Seconds per stub OpenAI call")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of OpenAI calls answered with 429")
+    parser.add_argument("--skip-db", action="store_true", help="Skip cases that need Postgres")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/bench_<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    with StubServer(openai_latency=args.openai_latency, rate_limit_rate=args.rate_limit_rate) as server:
+        _configure_environment(server)
+        report = BenchmarkSuite(server, args).run()
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"bench_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            return 1 if compare(report, json.load(f), args.threshold) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
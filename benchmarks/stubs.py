@@ -0,0 +1,190 @@
+# benchmarks/stubs.py
+
+import io
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+class _Body:
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def read(self) -> bytes:
+        return self._data
+
+class _Paginator:
+    def __init__(self, s3: "InMemoryS3"):
+        self._s3 = s3
+
+    def paginate(self, Bucket: str, Prefix: str = ""):
+        yield self._s3.list_objects_v2(Bucket=Bucket, Prefix=Prefix)
+
+class InMemoryS3:
+    """
+    Thread-safe in-memory stand-in for the subset of the boto3 S3 client the pipeline uses.
+    """
+
+    def __init__(self):
+        self._objects: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, **kwargs) -> dict:
+        with self._lock:
+            self._objects[Key] = {"Body": bytes(Body), "LastModified": datetime.now(timezone.utc)}
+        return {}
+
+    def upload_fileobj(self, fileobj, Bucket: str, Key: str, ExtraArgs: Optional[dict] = None) -> None:
+        self.put_object(Bucket=Bucket, Key=Key, Body=fileobj.read())
+
+    def get_object(self, Bucket: str, Key: str) -> dict:
+        with self._lock:
+            return {"Body": _Body(self._objects[Key]["Body"])}
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = "") -> dict:
+        with self._lock:
+            contents = [
+                {"Key": key, "LastModified": obj["LastModified"], "Size": len(obj["Body"])}
+                for key, obj in self._objects.items() if key.startswith(Prefix)
+            ]
+        return {"Contents": contents} if contents else {}
+
+    def get_paginator(self, operation: str) -> _Paginator:
+        return _Paginator(self)
+
+    def copy_object(self, CopySource: dict, Bucket: str, Key: str, **kwargs) -> dict:
+        with self._lock:
+            self._objects[Key] = dict(self._objects[CopySource["Key"]])
+        return {}
+
+    def delete_object(self, Bucket: str, Key: str) -> dict:
+        with self._lock:
+            self._objects.pop(Key, None)
+        return {}
+
+    def delete_objects(self, Bucket: str, Delete: dict) -> dict:
+        with self._lock:
+            for obj in Delete["Objects"]:
+                self._objects.pop(obj["Key"], None)
+        return {}
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(len(obj["Body"]) for obj in self._objects.values())
+
+FAKE_SUMMARY = json.dumps({
+    "Job Description": "Build and operate batch and streaming data pipelines.",
+    "Qualifications Needed": ["Python", "SQL", "Spark"],
+    "Job Responsibilities": ["Design pipelines", "Maintain the warehouse"],
+    "Job Benefits": ["Health insurance", "401(k)"],
+})
+
+class StubServer:
+    """
+    Local HTTP server standing in for RapidAPI JSearch and the OpenAI chat API.
+
+    GET /search returns the configured payload. POST /v1/chat/completions
+    sleeps for `openai_latency` seconds and answers 429 for a
+    `rate_limit_rate` share of requests.
+    """
+
+    def __init__(self, payload: Optional[dict] = None, openai_latency: float = 0.05, rate_limit_rate: float = 0.0):
+        self.payload = payload or {"data": []}
+        self.openai_latency = openai_latency
+        self.rate_limit_rate = rate_limit_rate
+        self.requests = {"search": 0, "chat": 0, "rate_limited": 0}
+        self._rng = random.Random(7)
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: dict) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                stub.requests["search"] += 1
+                self._send(200, stub.payload)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                stub.requests["chat"] += 1
+                time.sleep(stub.openai_latency)
+                if stub._rng.random() < stub.rate_limit_rate:
+                    stub.requests["rate_limited"] += 1
+                    self._send(429, {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}})
+                    return
+                self._send(200, {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": "stub",
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": FAKE_SUMMARY}}],
+                    "usage": {"prompt_tokens": 400, "completion_tokens": 80, "total_tokens": 480},
+                })
+
+        return Handler
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+# Original job_data layout the loader migrates from; production created it by hand
+BASE_JOB_DATA_DDL = """
+    CREATE TABLE IF NOT EXISTS job_data (
+        job_title TEXT,
+        employer_name TEXT,
+        job_employment_type TEXT,
+        job_application_link TEXT,
+        job_description TEXT,
+        job_is_remote BOOLEAN,
+        job_location TEXT,
+        job_city TEXT,
+        job_state TEXT,
+        job_country TEXT,
+        job_benefits TEXT,
+        job_salary NUMERIC,
+        job_min_salary NUMERIC,
+        job_max_salary NUMERIC,
+        job_highlights TEXT,
+        job_responsibilities TEXT,
+        date_posted TIMESTAMP,
+        job_hash TEXT UNIQUE,
+        integrated_timestamp TIMESTAMPTZ
+    )
+"""
+
+def reset_database(conn) -> None:
+    """Drop every table the pipeline creates so each size starts from empty"""
+    with conn, conn.cursor() as cursor:
+        cursor.execute("""
+            DROP MATERIALIZED VIEW IF EXISTS job_facet_counts, job_salary_stats, job_salary_histogram;
+            DROP TABLE IF EXISTS job_data, job_data_legacy, job_data_version, job_data_migrations, job_filter_values,
+                job_vectors, job_similar, fetch_query_stats CASCADE;
+        """)
+        cursor.execute(BASE_JOB_DATA_DDL)
@@ -0,0 +1,83 @@
+# benchmarks/synthetic.py
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+TITLES = [
+    "Data Engineer", "Senior Data Engineer", "Analytics Engineer", "Machine Learning Engineer",
+    "Backend Engineer", "Data Platform Engineer", "ETL Developer", "Big Data Engineer",
+]
+EMPLOYERS = [
+    "Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries",
+    "Wayne Enterprises", "Wonka Industries", "Tyrell Corp", "Cyberdyne Systems",
+]
+LOCATIONS = [
+    ("New York", "NY"), ("San Francisco", "CA"), ("Austin", "TX"), ("Seattle", "WA"),
+    ("Chicago", "IL"), ("Boston", "MA"), ("Denver", "CO"), ("Atlanta", "GA"),
+]
+EMPLOYMENT_TYPES = ["FULLTIME", "PARTTIME", "CONTRACTOR", "INTERN"]
+SALARY_PERIODS = ["YEAR", "HOUR", "MONTH", None]
+VOCABULARY = (
+    "python sql spark kafka airflow dbt aws gcp azure snowflake redshift postgres "
+    "pipelines streaming batch warehouse lakehouse modeling orchestration testing "
+    "collaborate stakeholders design build maintain scalable reliable data quality "
+    "monitoring terraform docker kubernetes analytics dashboards governance"
+).split()
+
+def _description(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words)).capitalize() + "."
+
+def generate_listing(rng: random.Random, index: int, description_words: int) -> Dict[str, Any]:
+    """One JSearch-shaped job listing"""
+    city, state = rng.choice(LOCATIONS)
+    period = rng.choice(SALARY_PERIODS)
+    if period == "HOUR":
+        low = rng.randint(30, 80)
+    elif period == "MONTH":
+        low = rng.randint(5, 15) * 1000
+    else:
+        low = rng.randint(70, 200) * 1000
+    posted = datetime.now(timezone.utc) - timedelta(days=rng.randint(0, 90), minutes=index)
+    return {
+        "job_id": f"synthetic-{index}",
+        "job_title": rng.choice(TITLES),
+        "employer_name": rng.choice(EMPLOYERS),
+        "job_employment_type": rng.choice(EMPLOYMENT_TYPES),
+        "job_apply_link": f"https://jobs.example.com/apply/{index}",
+        "job_description": _description(rng, description_words),
+        "job_is_remote": rng.random() < 0.3,
+        "job_location": f"{city}, {state}",
+        "job_city": city,
+        "job_state": state,
+        "job_country": "US",
+        "job_posted_at_datetime_utc": posted.isoformat(),
+        "job_min_salary": low if period else None,
+        "job_max_salary": int(low * 1.25) if period else None,
+        "job_salary_period": period,
+        "job_highlights": {
+            "Qualifications": [_description(rng, 8) for _ in range(3)],
+            "Responsibilities": [_description(rng, 8) for _ in range(3)],
+        },
+    }
+
+def generate_payload(
+    size: int,
+    duplication_rate: float = 0.1,
+    description_words: int = 300,
+    seed: Optional[int] = 42
+) -> Dict[str, Any]:
+    """
+    Build a JSearch /search response with `size` listings.
+
+    A `duplication_rate` share of listings are exact repeats of earlier ones,
+    exercising hashing, dedup and the simplification cache.
+    """
+    rng = random.Random(seed)
+    listings: List[Dict[str, Any]] = []
+    for index in range(size):
+        if listings and rng.random() < duplication_rate:
+            listings.append(dict(rng.choice(listings)))
+        else:
+            listings.append(generate_listing(rng, index, description_words))
+    return {"status": "OK", "request_id": "synthetic", "data": listings}
@@ -1,16 +1,138 @@
 # main.py
-from src.jobs.fetch_jobs import main_fetch
-from src.jobs.process_jobs import process_jobs
-from src.jobs.load_to_postgresql import load_data_to_postgres
+import argparse
+import importlib
+from contextlib import ExitStack, contextmanager
+from typing import Callable, List, Optional
+from psycopg2 import OperationalError
+from src.clients.postgres_client import pipeline_lock
+from src.utils.config import PIPELINE_MODE, WORKER_INTERVAL_SECONDS
 from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.profiling import profiler
 
-def main(): 
+# Entry points as "module:function"; each module is imported only when its command runs
+TARGETS = {
+    "fetch": "src.jobs.fetch_jobs:main_fetch",
+    "process": "src.jobs.process_jobs:process_jobs",
+    "load": "src.jobs.load_to_postgresql:load_data_to_postgres",
+    "streaming": "src.jobs.pipeline_runner:run_streaming_pipeline",
+    "worker": "src.jobs.worker:run_worker",
+    "dashboard-warm": "src.jobs.dashboard_warm:warm_dashboard",
+}
+COMMANDS = ("fetch", "process", "load", "run", "dashboard-warm")
+
+def command_targets(command: str, mode: str = PIPELINE_MODE, worker: bool = False) -> List[str]:
+    """Entry points a subcommand needs, in the order it calls them"""
+    if command != "run":
+        return [TARGETS[command]]
+    if worker:
+        return [TARGETS["worker"]]
+    if mode == "streaming":
+        return [TARGETS["streaming"]]
+    return [TARGETS["fetch"], TARGETS["process"], TARGETS["load"]]
+
+def import_command(command: str, mode: str = PIPELINE_MODE, worker: bool = False) -> List[Callable]:
+    """Import a subcommand's entry points and nothing else"""
+    functions = []
+    for target in command_targets(command, mode, worker):
+        module_name, function_name = target.split(":")
+        functions.append(getattr(importlib.import_module(module_name), function_name))
+    return functions
+
+@contextmanager
+def run_lock(command: str):
+    """
+    Hold the pipeline lock for a CLI run.
+
+    fetch and process need no database, so when Postgres is unreachable the
+    run goes ahead unlocked with a warning instead of failing up front.
+    """
+    with ExitStack() as stack:
+        try:
+            acquired = stack.enter_context(pipeline_lock())
+        except OperationalError as e:
+            logger.warning(f"Postgres unreachable ({str(e).splitlines()[0]}); running {command} without the pipeline lock")
+            acquired = True
+        yield acquired
+
+def main(mode: str = PIPELINE_MODE):
+    """Run fetch, process and load once, unless another run holds the pipeline lock"""
     try:
-        main_fetch()
-        process_jobs()
-        load_data_to_postgres()
+        with run_lock("run") as acquired:
+            if not acquired:
+                logger.warning("Another pipeline run is in progress; skipping this run")
+                return
+            if mode == "streaming":
+                run_streaming_pipeline, = import_command("run", mode)
+                run_streaming_pipeline()
+                return
+            main_fetch, process_jobs, load_data_to_postgres = import_command("run", mode)
+            if main_fetch() is None:
+                logger.info("No listings fetched; skipping processing and load")
+                return
+            process_jobs()
+            load_data_to_postgres()
     except Exception as e:
         logger.error("ETL pipeline failed at some step.", exc_info=True)
+    finally:
+        metrics.flush()
+        profiler.flush()
+
+def run_stage(command: str, **kwargs) -> None:
+    """Run a single stage and write its metrics, unless another run holds the pipeline lock"""
+    stage, = import_command(command)
+    try:
+        with run_lock(command) as acquired:
+            if not acquired:
+                logger.warning(f"Another pipeline run is in progress; skipping {command}")
+                return
+            stage(**kwargs)
+    except Exception:
+        logger.error(f"{command} failed", exc_info=True)
+        raise
+    finally:
+        metrics.flush()
+        profiler.flush()
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command-line interface; no subcommand runs the whole pipeline"""
+    parser = argparse.ArgumentParser(description="Job data ETL pipeline")
+    parser.add_argument("--worker", action="store_true", help="Run continuously on a schedule")
+    parser.add_argument("--interval", type=int, default=WORKER_INTERVAL_SECONDS, help="Seconds between worker runs")
+    parser.add_argument("--profile", action="store_true", help="Write CPU, memory and event-loop profiles under logs/profiles")
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("fetch", help="Fetch due queries from RapidAPI into raw_data/")
+    subparsers.add_parser("process", help="Clean and enrich the latest raw file into processed_data/")
+    subparsers.add_parser("load", help="Load the latest processed file into PostgreSQL")
+
+    run = subparsers.add_parser("run", help="Run the whole pipeline (default)")
+    run.add_argument("--mode", choices=("streaming", "sequential"), default=PIPELINE_MODE)
+    # SUPPRESS keeps the top-level values when these are given before the subcommand
+    run.add_argument("--worker", action="store_true", default=argparse.SUPPRESS, help="Run continuously on a schedule")
+    run.add_argument("--interval", type=int, default=argparse.SUPPRESS, help="Seconds between worker runs")
+
+    warm = subparsers.add_parser("dashboard-warm", help="Run the dashboard's landing queries to warm Postgres")
+    warm.add_argument("--refresh", action="store_true", help="Refresh aggregate views first")
+    return parser
+
+def cli(argv: Optional[List[str]] = None) -> None:
+    """Parse arguments and dispatch to the requested subcommand"""
+    args = build_parser().parse_args(argv)
+    command = args.command or "run"
+    if args.profile:
+        profiler.enable()
+
+    if command == "run":
+        if args.worker:
+            run_worker, = import_command("run", worker=True)
+            run_worker(args.interval, getattr(args, "mode", PIPELINE_MODE))
+        else:
+            main(getattr(args, "mode", PIPELINE_MODE))
+    elif command == "dashboard-warm":
+        run_stage(command, refresh=args.refresh)
+    else:
+        run_stage(command)
 
 if __name__ == "__main__":
-    main()
+    cli()
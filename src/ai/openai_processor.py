@@ -2,23 +2,39 @@
 
 import json
 import re
-import openai
-from openai import AsyncOpenAI
 import hashlib
 import logging
+import time
 from typing import Optional
 from src.utils.config import OPENAI_KEY, OPENAI_MODEL
+from src.utils.metrics import metrics
+from src.utils.profiling import profiler
 
-# Configure OpenAI client
-client = AsyncOpenAI(api_key=OPENAI_KEY)
+# OpenAI client, built on first use by get_openai_client()
+client = None
 
-# Set up logging
-logger = logging.getLogger(__name__)
+# Set up logging; a child of the pipeline logger so records reach its handler
+logger = logging.getLogger("etl_pipeline.openai")
 
 # Cache configuration
 CACHE_SIZE_LIMIT = 1000  # Prevent unlimited memory growth
 simplification_cache = {}
 
+def get_openai_client():
+    """Return the shared AsyncOpenAI client, importing the SDK and building it on first use."""
+    global client
+    if client is None:
+        from openai import AsyncOpenAI
+        client = AsyncOpenAI(api_key=OPENAI_KEY)
+    return client
+
+async def close_openai_client() -> None:
+    """Close the shared client if one was built."""
+    global client
+    if client is not None:
+        await client.close()
+        client = None
+
 def _create_cache_key(prompt_template: str, text: str, **kwargs) -> str:
     """Create unique cache key considering all relevant parameters."""
     key_data = f"{prompt_template}{text}{kwargs}"
@@ -54,17 +70,19 @@ async def simplify_text(
         or the original text wrapped in a dict on error.
     """
     if not text.strip():
-        print("Empty text received; returning as is.")
+        logger.debug("Empty text received; returning as is.")
         return {"job_description": text, "qualifications_needed": "", "job_responsibilities": "", "job_benefits": ""}
     
     cache_key = _create_cache_key(prompt_template, text, max_tokens=max_tokens, temperature=temperature)
     
     if cache_key in simplification_cache:
-        print("Cache hit for simplified text")
+        logger.debug("Cache hit for simplified text")
+        metrics.inc("openai_cache_requests_total", result="hit")
         cached_output = simplification_cache[cache_key]
         parsed = parse_simplified_job_info(cached_output)
         return parsed
 
+    metrics.inc("openai_cache_requests_total", result="miss")
     full_prompt = prompt_template.replace("<<INSERT JOB TEXT HERE>>", text)
     # print("Full prompt being sent to the model:")
     # print(full_prompt)
@@ -72,8 +90,9 @@ async def simplify_text(
     simplified_text = text  # Fallback value
 
     for attempt in range(retries):
+        started = time.perf_counter()
         try:
-            response = await client.chat.completions.create(
+            response = await get_openai_client().chat.completions.create(
                 model=model,
                 messages=[
                     {
@@ -85,27 +104,33 @@ async def simplify_text(
                 max_tokens=max_tokens,
                 temperature=temperature,
             )
+            metrics.observe("openai_request_seconds", time.perf_counter() - started, outcome="ok")
+            if response.usage:
+                metrics.inc("openai_tokens_total", response.usage.prompt_tokens, kind="prompt")
+                metrics.inc("openai_tokens_total", response.usage.completion_tokens, kind="completion")
             simplified_text = response.choices[0].message.content.strip()
-            print(f"Response received on attempt {attempt+1}:")
+            logger.debug(f"Response received on attempt {attempt+1}")
             
             # Update cache and enforce size limit
             if len(simplification_cache) >= CACHE_SIZE_LIMIT:
                 simplification_cache.popitem()
             simplification_cache[cache_key] = simplified_text
             
-            print(f"Successfully generated simplified text on attempt {attempt+1}")
+            logger.debug(f"Successfully generated simplified text on attempt {attempt+1}")
             break
         except Exception as e:
-            print(f"Attempt {attempt+1} failed: {str(e)}")
+            metrics.observe("openai_request_seconds", time.perf_counter() - started, outcome="error")
+            metrics.inc("openai_errors_total", error=type(e).__name__)
+            logger.warning(f"Attempt {attempt+1} failed: {str(e)}")
             if attempt == retries - 1:
-                print("All retries exhausted, returning original text")
+                logger.error("All retries exhausted, returning original text")
     
     # Integrate parsing: convert the raw JSON output into a dictionary with the 4 headers.
     try:
         parsed_output = parse_simplified_job_info(simplified_text)
         return parsed_output
     except Exception as e:
-        print(f"Parsing failed: {str(e)}. Returning raw simplified text.")
+        logger.warning(f"Parsing failed: {str(e)}. Returning raw simplified text.")
         #return {"job_description": simplified_text, "qualifications_needed": "", "job_responsibilities": "", "job_benefits": ""}
 
 
@@ -136,6 +161,7 @@ async def simplify_job_info(job_data_json_output: str) -> str:
 
 
 # Testing 
+@profiler.hot
 def parse_simplified_job_info(api_response: str) -> dict:
     """
     Parse the API output containing simplified job information.
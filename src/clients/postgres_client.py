@@ -1,11 +1,14 @@
 import psycopg2
-from psycopg2.pool import SimpleConnectionPool
+from contextlib import contextmanager
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.pool import ThreadedConnectionPool
 from psycopg2 import DatabaseError
 from src.utils.config import (
-    DB_HOST, DB_NAME, DB_USER, DB_PASS, DB_PORT,
-    POOL_MIN_CONN, POOL_MAX_CONN, CONNECTION_TIMEOUT
+    DB_HOST, DB_NAME, DB_USER, DB_PASS, DB_PORT, DB_SSLMODE,
+    POOL_MIN_CONN, POOL_MAX_CONN, CONNECTION_TIMEOUT, WORKER_LOCK_ID
 )
 from src.utils.logger import logger
+from src.utils.metrics import metrics
 
 class PostgresClient:
     _pool = None
@@ -14,7 +17,8 @@ class PostgresClient:
     def initialize_pool(cls):
         if cls._pool is None:
             try:
-                cls._pool = SimpleConnectionPool(
+                # Threaded: stages and the worker borrow connections from worker threads
+                cls._pool = ThreadedConnectionPool(
                     POOL_MIN_CONN,
                     POOL_MAX_CONN,
                     host=DB_HOST,
@@ -23,7 +27,7 @@ class PostgresClient:
                     password=DB_PASS,
                     port=DB_PORT,
                     connect_timeout=CONNECTION_TIMEOUT,
-                    sslmode="require"
+                    sslmode=DB_SSLMODE
                 )
                 logger.info("PostgreSQL connection pool initialized")
             except Exception as e:
@@ -34,7 +38,32 @@ class PostgresClient:
     def get_connection(cls):
         if cls._pool is None:
             cls.initialize_pool()
-        return cls._pool.getconn()
+        with metrics.timer("db_pool_wait_seconds"):
+            conn = cls._pool.getconn()
+        # Long-lived processes can hold connections the server has since dropped
+        for _ in range(POOL_MAX_CONN):
+            if cls._is_alive(conn):
+                break
+            logger.warning("Discarding dead pooled PostgreSQL connection")
+            metrics.inc("db_dead_connections_total")
+            cls._pool.putconn(conn, close=True)
+            conn = cls._pool.getconn()
+        return conn
+
+    @staticmethod
+    def _is_alive(conn) -> bool:
+        """Round-trip check; conn.closed only reflects failures the client has already seen"""
+        if conn.closed:
+            return False
+        if conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
 
     @classmethod
     def release_connection(cls, conn):
@@ -44,4 +73,27 @@ class PostgresClient:
     @classmethod
     def close_all_connections(cls):
         if cls._pool:
-            cls._pool.closeall()
\ No newline at end of file
+            cls._pool.closeall()
+            cls._pool = None
+@contextmanager
+def pipeline_lock(lock_id: int = WORKER_LOCK_ID):
+    """
+    Hold a session-level Postgres advisory lock for the duration of a run.
+
+    Yields False without blocking when another worker or a cron-started
+    run already holds the lock.
+    """
+    conn = PostgresClient.get_connection()
+    acquired = False
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", (lock_id,))
+            acquired = cursor.fetchone()[0]
+        yield acquired
+    finally:
+        if acquired:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", (lock_id,))
+        conn.autocommit = False
+        PostgresClient.release_connection(conn)
@@ -1,12 +1,46 @@
-import boto3
-from src.utils.config import AWS_ACCESS_KEY, AWS_SECRET_KEY
+import threading
+from src.utils.config import (
+    AWS_ACCESS_KEY, AWS_SECRET_KEY,
+    S3_MAX_POOL_CONNECTIONS, S3_MAX_RETRY_ATTEMPTS
+)
+
+_client = None
+_client_lock = threading.Lock()
+
+def _build_s3_client():
+    """Build a boto3 S3 client with a connection pool sized for concurrent transfers."""
+    # boto3 is slow to import; stages that never touch S3 should not pay for it
+    import boto3
+    from botocore.config import Config
 
-def get_s3_client():
-    """
-    Returns a boto3 S3 client using credentials from configuration.
-    """
     return boto3.client(
         "s3",
         aws_access_key_id=AWS_ACCESS_KEY,
-        aws_secret_access_key=AWS_SECRET_KEY
+        aws_secret_access_key=AWS_SECRET_KEY,
+        config=Config(
+            max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+            retries={"max_attempts": S3_MAX_RETRY_ATTEMPTS, "mode": "adaptive"}
+        )
     )
+
+def get_s3_client():
+    """
+    Returns a shared boto3 S3 client using credentials from configuration.
+
+    The client is created once per process; boto3 clients are thread-safe
+    once built, so the same instance is reused by every stage and worker thread.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _build_s3_client()
+    return _client
+
+def close_s3_client() -> None:
+    """Close the shared client's connection pool if one was built."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
@@ -2,10 +2,22 @@
 
 import streamlit as st
 import psycopg2
-from datetime import datetime
-from typing import List, Dict
-from src.utils.config import DB_HOST, DB_NAME, DB_USER, DB_PASS, DB_PORT
+import threading
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+import tempfile
+from uuid import uuid4
+from typing import List, Dict, Optional, Tuple
+from src.utils.config import (
+    DB_HOST, DB_NAME, DB_USER, DB_PASS, DB_PORT, S3_BUCKET, DASHBOARD_EXPORT_URL_SECONDS,
+    DASHBOARD_PAGE_SIZE, DASHBOARD_DEFAULT_POSTED_WITHIN_DAYS, DASHBOARD_POOL_MIN_CONN, DASHBOARD_POOL_MAX_CONN,
+    DASHBOARD_POOL_WAIT_SECONDS, DASHBOARD_CACHE_MAX_ENTRIES, DASHBOARD_VERSION_CHECK_SECONDS, DASHBOARD_METRICS_FLUSH_SECONDS
+)
+from src.utils.export_utils import EXPORT_FORMATS, write_export
+from src.utils.query_cache import VersionedQueryCache
 from src.utils.logger import logger
+from src.utils.metrics import metrics
 
 # Page configuration
 st.set_page_config(
@@ -15,9 +27,12 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-def get_db_connection():
-    """Create and return a PostgreSQL connection"""
-    return psycopg2.connect(
+@st.cache_resource
+def get_connection_pool() -> ThreadedConnectionPool:
+    """Process-wide PostgreSQL pool shared by every dashboard session"""
+    return ThreadedConnectionPool(
+        DASHBOARD_POOL_MIN_CONN,
+        DASHBOARD_POOL_MAX_CONN,
         host=DB_HOST,
         database=DB_NAME,
         user=DB_USER,
@@ -25,67 +40,424 @@ def get_db_connection():
         port=DB_PORT
     )
 
-@st.cache_data(ttl=3600, show_spinner="Loading jobs...")
-def fetch_jobs(filters: dict = None) -> List[Dict]:
-    """Fetch jobs from PostgreSQL with optional filters"""
-    base_query = """
-        SELECT 
-            job_title, employer_name, job_employment_type,
-            job_application_link, job_description, job_is_remote,
-            job_location, job_city, job_state, job_country,
-            job_benefits, job_salary, job_min_salary, job_max_salary,
-            job_highlights, job_responsibilities, date_posted
-        FROM job_data
-        WHERE 1=1
-    """
-    params = []
-    
-    # Build filter conditions
+@st.cache_resource
+def get_pool_slots() -> threading.BoundedSemaphore:
+    """One slot per pooled connection; the pool itself raises instead of waiting when exhausted"""
+    return threading.BoundedSemaphore(DASHBOARD_POOL_MAX_CONN)
+
+@contextmanager
+def get_db_connection():
+    """Borrow a connection from the shared pool, waiting up to DASHBOARD_POOL_WAIT_SECONDS for one"""
+    pool = get_connection_pool()
+    slots = get_pool_slots()
+    with metrics.timer("dashboard_pool_wait_seconds"):
+        if not slots.acquire(timeout=DASHBOARD_POOL_WAIT_SECONDS):
+            metrics.inc("dashboard_pool_timeouts_total")
+            raise PoolError(f"No dashboard connection free after {DASHBOARD_POOL_WAIT_SECONDS}s")
+    try:
+        conn = pool.getconn()
+        discard = False
+        try:
+            yield conn
+        finally:
+            # Reads leave an open transaction; end it before returning the connection
+            try:
+                conn.rollback()
+            except psycopg2.Error as e:
+                logger.warning(f"Discarding broken dashboard connection: {str(e)}")
+                discard = True
+            # Always hand the connection back, closing it if it is unusable
+            pool.putconn(conn, close=discard or bool(conn.closed))
+    finally:
+        slots.release()
+
+def get_data_version():
+    """Return the loader's data version, falling back to the latest load time"""
+    try:
+        rows = _run_query("SELECT version FROM job_data_version WHERE id = 1", [])
+        if rows:
+            return rows[0]["version"]
+    except psycopg2.Error:
+        pass
+    try:
+        return _run_query("SELECT MAX(integrated_timestamp) AS version FROM job_data", [])[0]["version"]
+    except Exception as e:
+        logger.error(f"Failed to read data version: {str(e)}")
+        return None
+
+@st.cache_resource
+def get_query_cache() -> VersionedQueryCache:
+    """Process-wide result cache that invalidates when the data version changes"""
+    return VersionedQueryCache(
+        get_data_version,
+        max_entries=DASHBOARD_CACHE_MAX_ENTRIES,
+        version_check_interval=DASHBOARD_VERSION_CHECK_SECONDS
+    )
+
+def cached_query(name: str, compute, *args):
+    """Serve a query result from the versioned cache"""
+    cache = get_query_cache()
+    return cache.get_or_compute(cache.make_key(name, *args), compute)
+
+LIST_COLUMNS = """
+    job_title, employer_name, job_employment_type,
+    job_application_link, job_is_remote,
+    job_location, job_city, job_state, job_country,
+    job_salary, job_min_salary, job_max_salary,
+    job_salary_currency, job_annual_min_salary, job_annual_max_salary,
+    date_posted, job_hash
+"""
+
+def build_filter_clause(filters: dict = None) -> Tuple[List[str], List]:
+    """Translate dashboard filters into SQL conditions and parameters"""
     conditions = []
-    if filters:
-        if filters.get("search_query"):
-            conditions.append("""
-                (job_title ILIKE %s OR 
-                 job_description ILIKE %s OR 
-                 employer_name ILIKE %s)
-            """)
-            params.extend([f"%{filters['search_query']}%"]*3)
-            
-        if filters.get("location"):
-            conditions.append("(job_location ILIKE %s OR job_city ILIKE %s)")
-            params.extend([f"%{filters['location']}%"]*2)
-            
-        # Change from exact match to pattern matching
-        if filters.get("employment_type"):
-            conditions.append("job_employment_type ILIKE %s")
-            params.append(f"%{filters['employment_type']}%")
-            
-        if filters.get("remote_only"):
-            conditions.append("job_is_remote = TRUE")
-            
-        if filters.get("min_salary"):
-            conditions.append("COALESCE(job_salary, job_max_salary) >= %s")
-            params.append(filters["min_salary"])
+    params = []
+    if not filters:
+        return conditions, params
+
+    if filters.get("search_query"):
+        conditions.append("search_vector @@ websearch_to_tsquery('english', %s)")
+        params.append(filters["search_query"])
+        
+    if filters.get("location"):
+        conditions.append("(job_location ILIKE %s OR job_city ILIKE %s)")
+        params.extend([f"%{filters['location']}%"]*2)
+        
+    if filters.get("employer"):
+        conditions.append("employer_name ILIKE %s")
+        params.append(f"%{filters['employer']}%")
+
+    # Change from exact match to pattern matching
+    if filters.get("employment_type"):
+        conditions.append("job_employment_type ILIKE %s")
+        params.append(f"%{filters['employment_type']}%")
+        
+    if filters.get("posted_within_days"):
+        # Bounded date ranges let Postgres prune to the recent monthly partitions;
+        # day granularity keeps the cache key stable within a day
+        conditions.append("date_posted >= %s")
+        params.append(date.today() - timedelta(days=filters["posted_within_days"]))
 
-    query = base_query
+    if filters.get("remote_only"):
+        conditions.append("job_is_remote = TRUE")
+        
+    if filters.get("min_salary"):
+        # Range scan on (job_salary_currency, job_annual_max_salary)
+        conditions.append("job_salary_currency = 'USD' AND job_annual_max_salary >= %s")
+        params.append(filters["min_salary"])
+
+    return conditions, params
+
+def _keyset_condition(filters: dict, after: tuple) -> Tuple[str, List]:
+    """Condition selecting rows that sort strictly after the given cursor"""
+    if filters and filters.get("search_query"):
+        rank, job_hash = after
+        return (
+            "(ts_rank_cd(search_vector, websearch_to_tsquery('english', %s)) < %s::real"
+            " OR (ts_rank_cd(search_vector, websearch_to_tsquery('english', %s)) = %s::real"
+            " AND job_hash < %s))",
+            [filters["search_query"], rank, filters["search_query"], rank, job_hash]
+        )
+
+    date_posted, job_hash = after
+    if date_posted is None:
+        # NULL dates sort last, so only the NULL tail remains
+        return "(date_posted IS NULL AND job_hash < %s)", [job_hash]
+    # A row comparison bounds the index scan; it never matches NULL dates, which fetch_jobs reads separately
+    return "(date_posted, job_hash) < (%s, %s)", [date_posted, job_hash]
+
+def _run_query(query: str, params: list) -> List[Dict]:
+    """Execute a read query and return rows as dicts"""
+    with get_db_connection() as conn, conn.cursor() as cur:
+        cur.execute(query, params)
+        columns = [desc[0] for desc in cur.description]
+        return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+def fetch_jobs(
+    filters: dict = None,
+    after: Optional[tuple] = None,
+    page_size: int = DASHBOARD_PAGE_SIZE
+) -> Tuple[List[Dict], Optional[tuple]]:
+    """
+    Fetch one page of jobs from PostgreSQL with optional filters.
+
+    Pages are keyset-paginated on (date_posted, job_hash), or on
+    (search rank, job_hash) when a keyword search is active. Only the
+    columns needed for the card header are selected; detail text is
+    loaded separately by fetch_job_details().
+
+    Returns:
+        The page of rows and the cursor for the next page (None on the last page)
+    """
+    conditions, params = build_filter_clause(filters)
+    searching = bool(filters and filters.get("search_query"))
+
+    select = LIST_COLUMNS
+    # Newest first; with a search, most relevant first. The hash is a stable tie-breaker
+    order = " ORDER BY date_posted DESC NULLS LAST, job_hash DESC"
+    if searching:
+        select += ", ts_rank_cd(search_vector, websearch_to_tsquery('english', %s)) AS search_rank"
+        params = [filters["search_query"]] + params
+        order = " ORDER BY search_rank DESC, job_hash DESC"
+
+    def page_query(extra_conditions: List[str], extra_params: list, limit: int) -> List[Dict]:
+        page_conditions = conditions + extra_conditions
+        query = f"SELECT {select} FROM job_data WHERE 1=1"
+        if page_conditions:
+            query += " AND " + " AND ".join(page_conditions)
+        query += order + " LIMIT %s"
+        query_params = params + extra_params + [limit]
+        return cached_query("fetch_jobs", lambda: _run_query(query, query_params), query, query_params)
+
+    try:
+        keyset_conditions, keyset_params = [], []
+        if after:
+            condition, keyset_params = _keyset_condition(filters, after)
+            keyset_conditions.append(condition)
+        # One extra row tells us whether another page exists
+        rows = page_query(keyset_conditions, keyset_params, page_size + 1)
+        if after and not searching and after[0] is not None and len(rows) <= page_size:
+            # Dated rows ran out; continue into the NULL-date tail
+            rows = rows + page_query(["date_posted IS NULL"], [], page_size + 1 - len(rows))
+    except Exception as e:
+        logger.error(f"Database error: {str(e)}")
+        st.error("Failed to load jobs from database")
+        return [], None
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        sort_key = last["search_rank"] if searching else last["date_posted"]
+        next_cursor = (sort_key, last["job_hash"])
+    return rows, next_cursor
+
+def count_jobs(filters: dict = None) -> int:
+    """Count jobs matching the filters"""
+    conditions, params = build_filter_clause(filters)
+    query = "SELECT COUNT(*) AS total FROM job_data WHERE 1=1"
     if conditions:
         query += " AND " + " AND ".join(conditions)
-        
-    query += " ORDER BY date_posted DESC"
-    
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cur:
+        rows = cached_query("count_jobs", lambda: _run_query(query, params), query, params)
+        return rows[0]["total"]
+    except Exception as e:
+        logger.error(f"Database error: {str(e)}")
+        return 0
+
+def fetch_job_details(job_hash: str) -> Dict:
+    """Fetch the heavy detail text for a single job"""
+    query = """
+        SELECT job_description, job_responsibilities, job_benefits, job_highlights
+        FROM job_data
+        WHERE job_hash = %s
+    """
+    try:
+        rows = cached_query("fetch_job_details", lambda: _run_query(query, [job_hash]), job_hash)
+        return rows[0] if rows else {}
+    except Exception as e:
+        logger.error(f"Database error: {str(e)}")
+        st.error("Failed to load job details")
+        return {}
+
+EXPORT_COLUMNS = [
+    "job_title", "employer_name", "job_employment_type", "job_application_link",
+    "job_is_remote", "job_location", "job_city", "job_state", "job_country",
+    "job_salary_currency", "job_annual_min_salary", "job_annual_max_salary",
+    "date_posted", "job_description", "job_highlights", "job_responsibilities",
+    "job_benefits", "job_hash"
+]
+EXPORT_BATCH_SIZE = 2000
+
+def iter_export_batches(filters: dict = None, batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Stream rows matching the dashboard filters in fixed-size batches.
+
+    Uses a named (server-side) cursor so Postgres holds the result set and
+    only one batch is materialized in Python at a time.
+    """
+    conditions, params = build_filter_clause(filters)
+    query = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM job_data WHERE 1=1"
+    if conditions:
+        query += " AND " + " AND ".join(conditions)
+    query += " ORDER BY date_posted DESC NULLS LAST, job_hash DESC"
+
+    with get_db_connection() as conn:
+        with conn.cursor(name="dashboard_export") as cur:
+            cur.itersize = batch_size
             cur.execute(query, params)
-            columns = [desc[0] for desc in cur.description]
-            return [dict(zip(columns, row)) for row in cur.fetchall()]
+            while True:
+                batch = cur.fetchmany(batch_size)
+                if not batch:
+                    break
+                yield batch
+
+EXPORT_PREFIX = "exports/"
+
+def export_jobs(filters: dict, fmt: str) -> Tuple[str, int]:
+    """
+    Spool filtered jobs to a temporary file, upload it to S3 and return a download link with the row count.
+
+    The file never passes through Streamlit, so large exports stay on disk and
+    in S3 rather than in the server's memory.
+    """
+    from src.clients.s3_client import get_s3_client
+
+    s3 = get_s3_client()
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    key = f"{EXPORT_PREFIX}jobs_{stamp}_{uuid4().hex[:8]}.{fmt}"
+    with tempfile.TemporaryFile() as spool:
+        total = write_export(fmt, iter_export_batches(filters), EXPORT_COLUMNS, spool)
+        spool.seek(0)
+        s3.upload_fileobj(spool, S3_BUCKET, key, ExtraArgs={
+            "ContentType": "text/csv" if fmt == "csv" else "application/vnd.apache.parquet",
+            "ContentDisposition": f'attachment; filename="jobs_{date.today().isoformat()}.{fmt}"',
+        })
+    url = s3.generate_presigned_url(
+        "get_object", Params={"Bucket": S3_BUCKET, "Key": key}, ExpiresIn=DASHBOARD_EXPORT_URL_SECONDS
+    )
+    return url, total
+
+def display_export(filters: dict):
+    """Render the export controls for the current filters"""
+    with st.sidebar:
+        st.markdown("---")
+        st.header("⬇️ Export")
+        fmt = st.radio("Format", EXPORT_FORMATS, format_func=str.upper, horizontal=True)
+        if st.button("Prepare export"):
+            try:
+                with st.spinner("Exporting jobs..."):
+                    url, total = export_jobs(filters, fmt)
+                st.link_button(f"Download {total} jobs", url)
+                st.caption(f"Link expires in {DASHBOARD_EXPORT_URL_SECONDS // 60} minutes")
+            except Exception as e:
+                logger.error(f"Export failed: {str(e)}")
+                st.error("Export failed")
+
+TYPEAHEAD_LIMIT = 10
+
+def suggest_values(kind: str, text: str, limit: int = TYPEAHEAD_LIMIT) -> List[str]:
+    """Suggest distinct filter values of a kind ('location' or 'employer') matching text"""
+    text = (text or "").strip()
+    if not text:
+        return []
+    query = """
+        SELECT value
+        FROM job_filter_values
+        WHERE kind = %s AND job_count > 0 AND value ILIKE %s
+        ORDER BY similarity(value, %s) DESC, job_count DESC
+        LIMIT %s
+    """
+    params = [kind, f"%{text}%", text, limit]
+    try:
+        rows = cached_query("suggest_values", lambda: _run_query(query, params), *params)
     except Exception as e:
         logger.error(f"Database error: {str(e)}")
-        st.error("Failed to load jobs from database")
         return []
-    finally:
-        if conn:
-            conn.close()
+    return [row["value"] for row in rows]
+
+def suggest_locations(text: str) -> List[str]:
+    """Typeahead suggestions for the location filter"""
+    return suggest_values("location", text)
+
+def suggest_employers(text: str) -> List[str]:
+    """Typeahead suggestions for the employer filter"""
+    return suggest_values("employer", text)
+
+def typeahead_input(label: str, suggest) -> str:
+    """Free-text input with a suggestion picker underneath"""
+    text = st.text_input(label)
+    suggestions = suggest(text)
+    if suggestions and text not in suggestions:
+        choice = st.selectbox(
+            f"Matching {label.lower()}s",
+            [""] + suggestions,
+            format_func=lambda x: f"Use \"{text}\"" if x == "" else x
+        )
+        return choice or text
+    return text
+
+def fetch_similar_jobs(job_hash: str) -> List[Dict]:
+    """Fetch precomputed nearest neighbors of a job"""
+    # A listing reposted under another date_posted has one row per partition; show its latest
+    query = """
+        SELECT job_title, employer_name, job_location, job_application_link, score
+        FROM (
+            SELECT DISTINCT ON (s.similar_hash)
+                j.job_title, j.employer_name, j.job_location, j.job_application_link, s.score
+            FROM job_similar s
+            JOIN job_data j ON j.job_hash = s.similar_hash
+            WHERE s.job_hash = %s
+            ORDER BY s.similar_hash, j.date_posted DESC NULLS LAST
+        ) neighbors
+        ORDER BY score DESC
+    """
+    try:
+        return cached_query("fetch_similar_jobs", lambda: _run_query(query, [job_hash]), job_hash)
+    except Exception as e:
+        logger.error(f"Database error: {str(e)}")
+        return []
+
+def fetch_facets() -> Dict[str, List[Dict]]:
+    """Read precomputed facet counts, grouped by facet"""
+    query = "SELECT facet, value, job_count FROM job_facet_counts ORDER BY facet, job_count DESC"
+    try:
+        rows = cached_query("fetch_facets", lambda: _run_query(query, []))
+    except Exception as e:
+        logger.error(f"Database error: {str(e)}")
+        return {}
+    facets = {}
+    for row in rows:
+        facets.setdefault(row["facet"], []).append(row)
+    return facets
+
+def fetch_salary_summary() -> Tuple[Dict, List[Dict]]:
+    """Read precomputed salary percentiles and histogram buckets"""
+    stats_query = "SELECT * FROM job_salary_stats WHERE id = 1"
+    histogram_query = "SELECT bucket_start, job_count FROM job_salary_histogram ORDER BY bucket_start"
+    try:
+        stats = cached_query("salary_stats", lambda: _run_query(stats_query, []))
+        histogram = cached_query("salary_histogram", lambda: _run_query(histogram_query, []))
+    except Exception as e:
+        logger.error(f"Database error: {str(e)}")
+        return {}, []
+    return (stats[0] if stats else {}), histogram
+
+def display_market_overview(facets: Dict[str, List[Dict]]):
+    """Render salary percentiles, salary distribution and facet breakdowns"""
+    stats, histogram = fetch_salary_summary()
+    with st.expander("📊 Market Overview"):
+        if stats.get("salary_count"):
+            cols = st.columns(4)
+            for col, (label, key) in zip(cols, [
+                ("25th percentile", "p25_salary"),
+                ("Median", "median_salary"),
+                ("75th percentile", "p75_salary"),
+                ("90th percentile", "p90_salary"),
+            ]):
+                col.metric(label, f"${stats[key]:,.0f}")
+            st.caption(f"Based on {stats['salary_count']} listings with salary data")
+
+        if histogram:
+            st.bar_chart(
+                {
+                    "Salary from": [f"${row['bucket_start']:,.0f}" for row in histogram],
+                    "Jobs": [row["job_count"] for row in histogram],
+                },
+                x="Salary from",
+                y="Jobs"
+            )
+
+        facet_cols = st.columns(3)
+        for col, (facet, title) in zip(facet_cols, [
+            ("employment_type", "Employment Type"),
+            ("remote", "Remote"),
+            ("state", "Top States"),
+        ]):
+            with col:
+                st.markdown(f"**{title}**")
+                for row in facets.get(facet, [])[:10]:
+                    st.write(f"{row['value']}: {row['job_count']}")
 
 def format_salary(job: dict) -> str:
     """Format salary information with proper Unicode characters"""
@@ -95,6 +467,12 @@ def format_salary(job: dict) -> str:
         "font-family: sans-serif;"
     )
     
+    if job.get('job_annual_min_salary') is not None and job.get('job_annual_max_salary') is not None:
+        currency = job.get('job_salary_currency') or ''
+        low, high = job['job_annual_min_salary'], job['job_annual_max_salary']
+        amount = f"{low:,.0f}" if low == high else f"{low:,.0f} – {high:,.0f}"
+        return f"<span style='{salary_style}'>{currency} {amount} / year</span>"
+
     if job.get('job_salary'):
         return f"<span style='{salary_style}'>${job['job_salary']:,.0f}</span>"
         
@@ -135,41 +513,66 @@ def display_job_card(job: dict):
         with col2:
             st.link_button("Apply Now", job["job_application_link"])
         
-        # Collapsible details section
-        # Collapsible details section
-        with st.expander("View Job Details"):
+        # Collapsible details section; detail text is only fetched once opened
+        if st.toggle("View Job Details", key=f"details_{job['job_hash']}"):
+            details = fetch_job_details(job["job_hash"])
             tab1, tab2, tab3 = st.tabs(["Description", "Responsibilities", "Benefits"])
             
             with tab1:
-                desc = format_markdown_bullets(job["job_description"])
+                desc = format_markdown_bullets(details.get("job_description"))
                 st.markdown(desc or "*No description available*")
                 
             with tab2:
-                resp = format_markdown_bullets(job["job_responsibilities"])
+                resp = format_markdown_bullets(details.get("job_responsibilities"))
                 st.markdown(resp or "*No responsibilities listed*")
                 
             with tab3:
-                benefits = format_markdown_bullets(job["job_benefits"])
+                benefits = format_markdown_bullets(details.get("job_benefits"))
                 st.markdown(benefits or "*No benefits information available*")
 
+        if st.toggle("More like this", key=f"similar_{job['job_hash']}"):
+            similar = fetch_similar_jobs(job["job_hash"])
+            if not similar:
+                st.caption("No similar jobs found yet")
+            for other in similar:
+                st.markdown(
+                    f"[{other['job_title']}]({other['job_application_link']}) · "
+                    f"{other['employer_name']} - {other['job_location']}"
+                )
+
 def main():
     """Main dashboard layout and logic"""
     st.title("💼 AI-Powered Job Board")
     st.markdown("### Curated Tech Opportunities with AI-Enhanced Listings")
     
+    facets = fetch_facets()
+
     # Sidebar Filters
     with st.sidebar:
         st.header("🔍 Search Filters")
         
         search_query = st.text_input("Search jobs by keyword")
-        location = st.text_input("Location")
+        location = typeahead_input("Location", suggest_locations)
+        employer = typeahead_input("Employer", suggest_employers)
+        employment_types = [
+            row["value"] for row in facets.get("employment_type", [])
+            if row["value"] != "Unknown"
+        ] or ["Full-time", "Part-time", "Contract", "Internship"]
         employment_type = st.selectbox(
             "Employment Type",
-            ["", "Full-time", "Part-time", "Contract", "Internship"],
+            [""] + employment_types,
             format_func=lambda x: "Any" if x == "" else x
         )
         min_salary = st.number_input("Minimum Salary (USD)", min_value=0, step=10000)
         remote_only = st.checkbox("Remote Only")
+        posted_options = [7, 30, 90, 365, 0]
+        posted_within_days = st.selectbox(
+            "Posted Within",
+            posted_options,
+            index=posted_options.index(DASHBOARD_DEFAULT_POSTED_WITHIN_DAYS)
+            if DASHBOARD_DEFAULT_POSTED_WITHIN_DAYS in posted_options else len(posted_options) - 1,
+            format_func=lambda x: "Any time" if x == 0 else f"Last {x} days"
+        )
         
         st.markdown("---")
         st.markdown("ℹ️ Data updated hourly using AI processing")
@@ -178,16 +581,29 @@ def main():
     filters = {
         "search_query": search_query,
         "location": location,
+        "employer": employer,
         "employment_type": employment_type,
         "min_salary": min_salary if min_salary > 0 else None,
-        "remote_only": remote_only
+        "remote_only": remote_only,
+        "posted_within_days": posted_within_days
     }
     
+    display_market_overview(facets)
+    display_export(filters)
+
+    # Restart pagination whenever the filters change
+    if st.session_state.get("active_filters") != filters:
+        st.session_state.active_filters = filters
+        st.session_state.page_cursors = [None]
+    cursors = st.session_state.page_cursors
+
     # Load jobs
-    jobs = fetch_jobs(filters)
+    with st.spinner("Loading jobs..."):
+        jobs, next_cursor = fetch_jobs(filters, after=cursors[-1])
+        total = count_jobs(filters)
     
     # Display results
-    st.markdown(f"📄 **Found {len(jobs)} matching positions**")
+    st.markdown(f"📄 **Found {total} matching positions**")
     
     if not jobs:
         st.info("No jobs found matching your criteria. Try adjusting your filters.")
@@ -197,5 +613,21 @@ def main():
         display_job_card(job)
         st.markdown("---")
 
+    prev_col, page_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        if st.button("← Previous", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with page_col:
+        st.caption(f"Page {len(cursors)}")
+    with next_col:
+        if st.button("Next →", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        main()
+    finally:
+        # The Streamlit server never finishes a run; publish its metrics on a timer instead
+        metrics.maybe_flush(DASHBOARD_METRICS_FLUSH_SECONDS, name="dashboard", summary=False)
\ No newline at end of file
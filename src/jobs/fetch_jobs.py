@@ -1,8 +1,10 @@
 import json
 import logging
+import threading
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import requests
+from requests.adapters import HTTPAdapter
 from tenacity import (
     retry,
     wait_exponential,
@@ -13,7 +15,10 @@ from tenacity import (
 from requests.exceptions import RequestException, HTTPError
 from src.utils.config import RAPIDAPI_KEY, S3_BUCKET, RAPIDAPI_HOST, API_REQUEST_TIMEOUT
 from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.profiling import profiler
 from src.clients.s3_client import get_s3_client
+from src.jobs.query_scheduler import QueryScheduler, load_targets
 
 # Constants
 API_BASE_URL = "https://jsearch.p.rapidapi.com/search"
@@ -28,6 +33,28 @@ DEFAULT_QUERY_PARAMS = {
 S3_RAW_DATA_PREFIX = "raw_data/"
 RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
 
+_session = None
+_session_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    """Return the shared HTTP session so repeated fetches reuse warm TLS connections."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+                _session = session
+    return _session
+
+def close_http_session() -> None:
+    """Close the shared HTTP session and its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
 def _get_api_headers() -> Dict[str, str]:
     """Return standardized API headers."""
     return {
@@ -68,18 +95,20 @@ def fetch_jobs(params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         if params:
             final_params.update(params)
 
-        with requests.Session() as session:
-            response = session.get(
+        with metrics.timer("fetch_request_seconds"):
+            response = get_http_session().get(
                 API_BASE_URL,
                 headers=_get_api_headers(),
                 params=final_params,
                 timeout=API_REQUEST_TIMEOUT
             )
-            
-            response.raise_for_status()
-            
-            logger.debug(f"API response received - Status: {response.status_code}")
-            return response.json()
+        metrics.inc("fetch_requests_total", status=response.status_code)
+        metrics.inc("fetch_response_bytes_total", len(response.content))
+        
+        response.raise_for_status()
+        
+        logger.debug(f"API response received - Status: {response.status_code}")
+        return response.json()
 
     except HTTPError as e:
         if e.response.status_code in RETRY_STATUS_CODES:
@@ -91,14 +120,14 @@ def fetch_jobs(params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         logger.error("Failed to parse API response JSON")
         raise ValueError("Invalid JSON response") from e
 
-def upload_to_s3(data: Dict[str, Any], bucket: str) -> str:
+def upload_to_s3(data: Dict[str, Any], bucket: str, suffix: str = "") -> str:
     """Upload data to S3 with validation and error handling."""
     if not bucket:
         raise ValueError("S3 bucket name is required")
 
     try:
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        file_name = f"jobs_{timestamp}.json"
+        file_name = f"jobs_{timestamp}{suffix}.json"
         s3_key = f"{S3_RAW_DATA_PREFIX}{file_name}"
         data_bytes = json.dumps(data).encode("utf-8")
 
@@ -109,6 +138,7 @@ def upload_to_s3(data: Dict[str, Any], bucket: str) -> str:
             Body=data_bytes,
             ContentType="application/json"
         )
+        metrics.inc("s3_bytes_total", len(data_bytes), direction="upload")
 
         logger.info(f"Successfully uploaded to s3://{bucket}/{s3_key}")
         return s3_key
@@ -116,25 +146,57 @@ def upload_to_s3(data: Dict[str, Any], bucket: str) -> str:
         logger.error("S3 upload failed", exc_info=True)
         raise
 
-def main_fetch() -> None:
+def fetch_scheduled_jobs(scheduler: QueryScheduler, state) -> List[Dict[str, Any]]:
+    """Fetch one scheduled query, record its yield and return listings not already fetched this run."""
+    job_data = fetch_jobs(state.params)
+    jobs = job_data.get("data", [])
+    unique_jobs, new_count = scheduler.dedupe_listings(jobs)
+    scheduler.record(state, len(jobs), new_count)
+    metrics.inc("fetch_listings_total", len(jobs))
+    metrics.inc("fetch_new_listings_total", new_count)
+    logger.info(f"Query {state.params.get('query')!r} ({state.params.get('location')}): {new_count}/{len(jobs)} new")
+    return unique_jobs
+
+@profiler.profiled("fetch")
+def main_fetch() -> Optional[str]:
     """Orchestrate job fetching and data upload workflow."""
-    try:
-        if not all([RAPIDAPI_KEY, RAPIDAPI_HOST, S3_BUCKET]):
-            raise EnvironmentError("Missing required environment variables")
+    with metrics.stage("fetch") as stage:
+        try:
+            if not all([RAPIDAPI_KEY, RAPIDAPI_HOST, S3_BUCKET]):
+                raise EnvironmentError("Missing required environment variables")
 
-        # Fetch data
-        job_data = fetch_jobs()
-        logger.info(f"Received {len(job_data.get('data', []))} job listings")
+            # Pick the queries worth spending API calls on this run
+            scheduler = QueryScheduler(load_targets(DEFAULT_QUERY_PARAMS))
+            scheduler.load()
+            plan = scheduler.plan()
+            if not plan:
+                logger.info("No fetch queries are due")
+                return None
 
-        # Upload to S3
-        s3_key = upload_to_s3(job_data, S3_BUCKET)
-        
-        # Optional: Add subsequent processing steps here
-        return s3_key
+            # Fetch data
+            jobs = []
+            try:
+                for state in plan:
+                    try:
+                        jobs.extend(fetch_scheduled_jobs(scheduler, state))
+                    except Exception:
+                        logger.error(f"Query {state.params.get('query')!r} failed", exc_info=True)
+            finally:
+                scheduler.save()
+            logger.info(f"Received {len(jobs)} job listings")
+            stage.records = len(jobs)
+            if not jobs:
+                return None
 
-    except Exception as e:
-        logger.error("Job fetch pipeline failed", exc_info=True)
-        raise
+            # Upload to S3
+            s3_key = upload_to_s3({"data": jobs}, S3_BUCKET)
+            
+            # Optional: Add subsequent processing steps here
+            return s3_key
+
+        except Exception as e:
+            logger.error("Job fetch pipeline failed", exc_info=True)
+            raise
 
 if __name__ == "__main__":
     main_fetch()
\ No newline at end of file
@@ -3,10 +3,20 @@ from psycopg2.extras import execute_values
 from typing import List, Tuple, Optional
 from src.clients.s3_client import get_s3_client
 from src.clients.postgres_client import PostgresClient
-from src.jobs.loaders.s3_loader import get_latest_processed_file, archive_file
-from src.jobs.processors.data_processor import process_csv_data, REQUIRED_COLUMNS
+from src.jobs.loaders.s3_loader import list_processed_keys, download_processed_file, archive_files
+from src.jobs.loaders.schema import ensure_job_data_schema, mark_job_data_schema_ready, bump_data_version
+from src.jobs.loaders.aggregates import refresh_aggregates
+from src.jobs.loaders.partitions import migrate_to_partitioned, mark_migrated, ensure_partitions, apply_retention
+from src.jobs.loaders.similarity import refresh_similar_jobs
+from src.jobs.loaders.search_index import ensure_search_schema, mark_search_schema_ready
+from src.jobs.loaders.typeahead import (
+    ensure_typeahead_schema, mark_typeahead_schema_ready, refresh_filter_values, recount_filter_values
+)
+from src.jobs.processors.data_processor import process_processed_file, REQUIRED_COLUMNS
 from src.utils.config import S3_BUCKET
 from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.profiling import profiler
 
 def update_database(data: List[Tuple]) -> int:
     """Update database with processed data"""
@@ -14,30 +24,51 @@ def update_database(data: List[Tuple]) -> int:
         logger.warning("No data to insert")
         return 0
 
-    # Change the INSERT query to match the exact column name:
-    insert_query = f"""
-        INSERT INTO job_data ({', '.join(REQUIRED_COLUMNS)}, integrated_timestamp)
-        VALUES %s
-        ON CONFLICT (job_hash)
-        DO UPDATE SET
-            {', '.join(f"{col} = EXCLUDED.{col}" for col in REQUIRED_COLUMNS[2:])},
-            integrated_timestamp = NOW()
-    """
-
     conn = None
     try:
         conn = PostgresClient.get_connection()
         with conn, conn.cursor() as cursor:
-            execute_values(
-                cursor,
-                insert_query,
-                data,
-                page_size=1000
-            )
+            # Servers before PostgreSQL 15 keep the plain table, unique on job_hash alone
+            partitioned = migrate_to_partitioned(cursor)
+            if partitioned:
+                date_index = REQUIRED_COLUMNS.index("date_posted")
+                ensure_partitions(cursor, [row[date_index] for row in data])
+            ensure_job_data_schema(cursor)
+            ensure_search_schema(cursor)
+            ensure_typeahead_schema(cursor)
+
+            # Change the INSERT query to match the exact column name:
+            insert_query = f"""
+                INSERT INTO job_data ({', '.join(REQUIRED_COLUMNS)}, integrated_timestamp)
+                VALUES %s
+                ON CONFLICT ({'job_hash, date_posted' if partitioned else 'job_hash'})
+                DO UPDATE SET
+                    {', '.join(f"{col} = EXCLUDED.{col}" for col in REQUIRED_COLUMNS[2:])},
+                    integrated_timestamp = NOW()
+            """
+
+            with metrics.timer("db_upsert_seconds"):
+                execute_values(
+                    cursor,
+                    insert_query,
+                    data,
+                    page_size=1000
+                )
             affected_rows = cursor.rowcount
+            metrics.inc("db_rows_upserted_total", len(data))
             logger.info(f"Successfully upserted {affected_rows} records")
-            return affected_rows
-            
+
+            # Keep typeahead counts in step with the upserted rows
+            refresh_filter_values(cursor, data)
+            bump_data_version(cursor)
+
+        # Schema steps are only skipped once their DDL has committed
+        mark_migrated()
+        mark_job_data_schema_ready()
+        mark_search_schema_ready()
+        mark_typeahead_schema_ready()
+        return affected_rows
+
     except psycopg2.DatabaseError as e:
         logger.error(f"Database error: {str(e)}")
         raise
@@ -45,33 +76,74 @@ def update_database(data: List[Tuple]) -> int:
         if conn:
             PostgresClient.release_connection(conn)
 
+def run_maintenance(step: str, func, *args) -> bool:
+    """Run one post-load maintenance step; the loaded data is already committed, so failures are only logged"""
+    try:
+        func(*args)
+        return True
+    except Exception:
+        logger.error(f"Post-load maintenance step {step} failed; loaded data is unaffected", exc_info=True)
+        metrics.inc("maintenance_failures_total", step=step)
+        return False
+
+def finalize_load(s3) -> None:
+    """Run the table-wide maintenance that follows a successful load"""
+    # Move expired months out of the hot table before recomputing aggregates
+    run_maintenance("retention", apply_retention, s3)
+
+    # Drop typeahead counts for jobs that retention or deletes removed
+    run_maintenance("typeahead", recount_filter_values)
+
+    # Precompute dashboard facets and salary charts
+    run_maintenance("aggregates", refresh_aggregates)
+
+@profiler.profiled("load")
 def load_data_to_postgres() -> None:
     """Main ETL orchestration function"""
-    try:
-        s3 = get_s3_client()
-        
-        # Get latest processed file
-        file_key, csv_data = get_latest_processed_file(s3)
-        if not csv_data:
-            return
-
-        # Process data
-        processed_data = process_csv_data(csv_data)
-        if not processed_data:
-            logger.warning("No valid data processed")
-            return
-
-        # Update database
-        affected_rows = update_database(processed_data)
-        
-        # Archive file if successful
-        if affected_rows > 0:
-            if not archive_file(s3, file_key):
-                logger.error("Failed to archive processed file")
-
-    except Exception as e:
-        logger.error("ETL pipeline failed", exc_info=True)
-        raise
+    with metrics.stage("load") as stage:
+        try:
+            s3 = get_s3_client()
+
+            # Load every pending processed file, oldest first
+            keys = list_processed_keys(s3)
+            if not keys:
+                logger.warning("No processed data found in S3.")
+                return
+
+            loaded_keys, loaded_rows = [], []
+            for file_key in keys:
+                file_data = download_processed_file(s3, file_key)
+                if not file_data:
+                    continue
+
+                # Process data
+                processed_data = process_processed_file(file_key, file_data)
+                if not processed_data:
+                    logger.warning(f"No valid data processed from {file_key}")
+                    continue
+
+                # Update database
+                affected_rows = update_database(processed_data)
+                stage.records += len(processed_data)
+                if affected_rows > 0:
+                    loaded_keys.append(file_key)
+                    loaded_rows.extend(processed_data)
+
+            if not loaded_keys:
+                return
+
+            # Archive every loaded file in one batched copy/delete
+            manifest = archive_files(s3, loaded_keys)
+            if manifest["failed"]:
+                logger.error(f"Failed to archive {len(manifest['failed'])} processed file(s)")
+
+            # Precompute "more like this" neighbors for new or changed jobs
+            run_maintenance("similarity", refresh_similar_jobs, loaded_rows)
+            finalize_load(s3)
+
+        except Exception as e:
+            logger.error("ETL pipeline failed", exc_info=True)
+            raise
 
 if __name__ == "__main__":
     load_data_to_postgres()
\ No newline at end of file
@@ -0,0 +1,80 @@
+from src.clients.postgres_client import PostgresClient
+from src.jobs.loaders.schema import bump_data_version
+from src.utils.logger import logger
+
+SALARY_BUCKET_WIDTH = 20000
+SALARY_BUCKET_COUNT = 15  # Last bucket collects everything above 300k
+
+# Annual midpoint of a listing's normalized salary range, USD listings only
+SALARY_EXPRESSION = "(job_annual_min_salary + job_annual_max_salary) / 2"
+SALARY_SOURCE = f"SELECT {SALARY_EXPRESSION} AS salary FROM job_data WHERE job_salary_currency = 'USD'"
+
+AGGREGATE_VIEW_DDL = [
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS job_facet_counts AS
+    SELECT 'employment_type' AS facet, COALESCE(NULLIF(job_employment_type, ''), 'Unknown') AS value, COUNT(*) AS job_count
+    FROM job_data GROUP BY 2
+    UNION ALL
+    SELECT 'state', COALESCE(NULLIF(job_state, ''), 'Unknown'), COUNT(*)
+    FROM job_data GROUP BY 2
+    UNION ALL
+    SELECT 'country', COALESCE(NULLIF(job_country, ''), 'Unknown'), COUNT(*)
+    FROM job_data GROUP BY 2
+    UNION ALL
+    SELECT 'remote', CASE WHEN job_is_remote THEN 'Remote' ELSE 'On-site' END, COUNT(*)
+    FROM job_data GROUP BY 2
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_job_facet_counts_key ON job_facet_counts (facet, value)",
+    f"""
+    CREATE MATERIALIZED VIEW IF NOT EXISTS job_salary_stats AS
+    SELECT
+        1 AS id,
+        COUNT(*) AS salary_count,
+        MIN(salary) AS min_salary,
+        percentile_cont(0.25) WITHIN GROUP (ORDER BY salary) AS p25_salary,
+        percentile_cont(0.5) WITHIN GROUP (ORDER BY salary) AS median_salary,
+        percentile_cont(0.75) WITHIN GROUP (ORDER BY salary) AS p75_salary,
+        percentile_cont(0.9) WITHIN GROUP (ORDER BY salary) AS p90_salary,
+        MAX(salary) AS max_salary
+    FROM ({SALARY_SOURCE}) s
+    WHERE salary > 0
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_job_salary_stats_id ON job_salary_stats (id)",
+    f"""
+    CREATE MATERIALIZED VIEW IF NOT EXISTS job_salary_histogram AS
+    SELECT
+        LEAST(FLOOR(salary / {SALARY_BUCKET_WIDTH}), {SALARY_BUCKET_COUNT}) * {SALARY_BUCKET_WIDTH} AS bucket_start,
+        COUNT(*) AS job_count
+    FROM ({SALARY_SOURCE}) s
+    WHERE salary > 0
+    GROUP BY 1
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_job_salary_histogram_bucket ON job_salary_histogram (bucket_start)",
+]
+
+AGGREGATE_VIEWS = ["job_facet_counts", "job_salary_stats", "job_salary_histogram"]
+
+def ensure_aggregate_views(cursor) -> None:
+    """Create the facet and salary materialized views if missing"""
+    for statement in AGGREGATE_VIEW_DDL:
+        cursor.execute(statement)
+
+def refresh_aggregates() -> None:
+    """Recompute facet counts and salary aggregates after a load"""
+    conn = None
+    try:
+        conn = PostgresClient.get_connection()
+        with conn, conn.cursor() as cursor:
+            ensure_aggregate_views(cursor)
+            for view in AGGREGATE_VIEWS:
+                # CONCURRENTLY keeps the dashboard reading the previous snapshot meanwhile
+                cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}")
+            # Results cached against the pre-refresh snapshot are now stale
+            bump_data_version(cursor)
+        logger.info("Refreshed dashboard aggregates")
+    except Exception as e:
+        logger.error(f"Failed to refresh aggregates: {str(e)}")
+        raise
+    finally:
+        if conn:
+            PostgresClient.release_connection(conn)
@@ -0,0 +1,205 @@
+import gzip
+import re
+import tempfile
+from datetime import date
+from typing import Iterable, List, Optional, Set, Tuple
+from src.clients.postgres_client import PostgresClient
+from src.jobs.loaders.aggregates import AGGREGATE_VIEWS
+from src.utils.config import (
+    S3_BUCKET, PARTITION_MONTHS_AHEAD, PARTITION_RETENTION_MONTHS, PARTITION_DETACH_LOCK_TIMEOUT
+)
+from src.utils.logger import logger
+
+PARTITION_PREFIX = "job_data_p"
+DEFAULT_PARTITION = "job_data_default"
+PARTITION_ARCHIVE_PREFIX = "archive/job_data/"
+PARTITION_NAME_PATTERN = re.compile(rf"^{PARTITION_PREFIX}(\d{{4}})(\d{{2}})$")
+# UNIQUE NULLS NOT DISTINCT on the partitioned table needs PostgreSQL 15
+MIN_PARTITION_SERVER_VERSION = 150000
+
+_migrated = False
+_partitioned = False
+
+def _month_start(value) -> date:
+    """First day of the month containing value"""
+    return date(value.year, value.month, 1)
+
+def _add_months(month: date, months: int) -> date:
+    """Shift a month start by a number of months"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding the given month"""
+    return f"{PARTITION_PREFIX}{month.year:04d}{month.month:02d}"
+
+def is_partitioned(cursor) -> bool:
+    """Whether job_data is already a partitioned table"""
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('job_data')")
+    row = cursor.fetchone()
+    return bool(row) and row[0] == "p"
+
+def server_version(cursor) -> int:
+    """Server version as a number, e.g. 150004 for 15.4"""
+    cursor.execute("SELECT current_setting('server_version_num')::int")
+    return cursor.fetchone()[0]
+
+def create_partition(cursor, month: date) -> None:
+    """Create the monthly partition for month if missing"""
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {partition_name(month)}
+        PARTITION OF job_data
+        FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')
+    """)
+
+def ensure_partitions(cursor, dates: Iterable = (), months_ahead: int = PARTITION_MONTHS_AHEAD) -> None:
+    """Create partitions for the given dates plus the current and upcoming months"""
+    current = _month_start(date.today())
+    months: Set[date] = {_add_months(current, offset) for offset in range(months_ahead + 1)}
+    months.update(_month_start(value) for value in dates if value is not None)
+    for month in sorted(months):
+        create_partition(cursor, month)
+
+def migrate_to_partitioned(cursor) -> bool:
+    """
+    Convert a plain job_data table into one range-partitioned by month on date_posted.
+
+    The old table is kept as job_data_legacy (with its indexes renamed) so it can
+    be inspected and dropped by hand. Unique keys on a partitioned table must
+    include the partition key, so uniqueness becomes (job_hash, date_posted);
+    NULLS NOT DISTINCT keeps undated listings unique too, which needs
+    PostgreSQL 15+. Older servers keep the plain table. Returns whether
+    job_data is partitioned.
+    """
+    global _partitioned
+    if _migrated:
+        return _partitioned
+    cursor.execute("SELECT to_regclass('job_data')")
+    if cursor.fetchone()[0] is None:
+        return False
+    if is_partitioned(cursor):
+        _partitioned = True
+        return True
+    version = server_version(cursor)
+    if version < MIN_PARTITION_SERVER_VERSION:
+        logger.warning(
+            f"PostgreSQL {version // 10000} does not support UNIQUE NULLS NOT DISTINCT; "
+            f"job_data stays unpartitioned and partition retention is disabled (needs PostgreSQL 15+)"
+        )
+        _partitioned = False
+        return False
+
+    logger.info("Migrating job_data to monthly partitions")
+    # Materialized views bind to the table itself, not its name; rebuilt on next refresh
+    for view in AGGREGATE_VIEWS:
+        cursor.execute(f"DROP MATERIALIZED VIEW IF EXISTS {view}")
+    cursor.execute("ALTER TABLE job_data RENAME TO job_data_legacy")
+    cursor.execute("""
+        DO $$
+        DECLARE r record;
+        BEGIN
+            FOR r IN SELECT indexname FROM pg_indexes WHERE tablename = 'job_data_legacy' LOOP
+                EXECUTE format('ALTER INDEX %I RENAME TO %I', r.indexname, left(r.indexname, 50) || '_legacy');
+            END LOOP;
+        END $$
+    """)
+    cursor.execute("""
+        CREATE TABLE job_data (LIKE job_data_legacy INCLUDING DEFAULTS)
+        PARTITION BY RANGE (date_posted)
+    """)
+    cursor.execute("ALTER TABLE job_data ADD CONSTRAINT job_data_hash_date_key UNIQUE NULLS NOT DISTINCT (job_hash, date_posted)")
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF job_data DEFAULT")
+
+    cursor.execute("SELECT MIN(date_posted), MAX(date_posted) FROM job_data_legacy")
+    oldest, newest = cursor.fetchone()
+    if oldest and newest:
+        month = _month_start(oldest)
+        while month <= _month_start(newest):
+            create_partition(cursor, month)
+            month = _add_months(month, 1)
+    ensure_partitions(cursor)
+
+    cursor.execute("INSERT INTO job_data SELECT * FROM job_data_legacy")
+    logger.info(f"Copied {cursor.rowcount} rows into partitioned job_data")
+    _partitioned = True
+    return True
+
+def mark_migrated() -> None:
+    """Skip the partitioning check from now on; call once the migration has committed"""
+    global _migrated
+    _migrated = True
+
+def list_partitions(cursor) -> List[Tuple[str, date]]:
+    """Return (name, month) for every monthly partition, oldest first"""
+    cursor.execute("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass('job_data')
+    """)
+    partitions = []
+    for (name,) in cursor.fetchall():
+        match = PARTITION_NAME_PATTERN.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda item: item[1])
+
+def _partition_state(cursor, name: str) -> Tuple:
+    """Row count and latest load time of a partition, to spot writes after its export"""
+    cursor.execute(f"SELECT COUNT(*), MAX(integrated_timestamp) FROM {name}")
+    return cursor.fetchone()
+
+def _export_partition(cursor, s3_client, name: str) -> str:
+    """Stream a partition as gzipped CSV to the S3 archive prefix"""
+    archive_key = f"{PARTITION_ARCHIVE_PREFIX}{name}.csv.gz"
+    with tempfile.TemporaryFile() as spool:
+        with gzip.GzipFile(fileobj=spool, mode="wb") as gz:
+            cursor.copy_expert(f"COPY {name} TO STDOUT WITH (FORMAT csv, HEADER true)", gz)
+        spool.seek(0)
+        s3_client.upload_fileobj(spool, S3_BUCKET, archive_key, ExtraArgs={"ContentType": "application/gzip"})
+    return archive_key
+
+def apply_retention(s3_client, retention_months: Optional[int] = PARTITION_RETENTION_MONTHS) -> List[str]:
+    """
+    Export partitions older than the retention window to S3, then detach and drop them.
+
+    The export runs while the partition is still attached, holding only a
+    SHARE lock on that partition, so job_data stays readable and writable.
+    Detach and drop then run in a short transaction of their own; it gives up
+    after PARTITION_DETACH_LOCK_TIMEOUT, and is rolled back if the partition
+    changed since its export. Either way the partition stays attached for
+    the next run. Returns the archive keys written.
+    """
+    if not retention_months:
+        return []
+
+    cutoff = _add_months(_month_start(date.today()), -retention_months)
+    archived = []
+    conn = None
+    try:
+        conn = PostgresClient.get_connection()
+        with conn, conn.cursor() as cursor:
+            expired = [name for name, month in list_partitions(cursor) if month < cutoff]
+
+        for name in expired:
+            try:
+                with conn, conn.cursor() as cursor:
+                    # Blocks writes to this old month only while it is exported
+                    cursor.execute(f"LOCK TABLE {name} IN SHARE MODE")
+                    exported = _partition_state(cursor, name)
+                    archive_key = _export_partition(cursor, s3_client, name)
+
+                with conn, conn.cursor() as cursor:
+                    cursor.execute("SELECT set_config('lock_timeout', %s, true)", (PARTITION_DETACH_LOCK_TIMEOUT,))
+                    cursor.execute(f"ALTER TABLE job_data DETACH PARTITION {name}")
+                    if _partition_state(cursor, name) != exported:
+                        raise RuntimeError(f"{name} changed after its export; keeping it attached")
+                    cursor.execute(f"DROP TABLE {name}")
+                archived.append(archive_key)
+                logger.info(f"Archived partition {name} to s3://{S3_BUCKET}/{archive_key}")
+            except Exception as e:
+                logger.error(f"Failed to archive partition {name}: {str(e)}")
+    finally:
+        if conn:
+            PostgresClient.release_connection(conn)
+    return archived
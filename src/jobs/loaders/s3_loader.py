@@ -1,51 +1,155 @@
-from typing import Optional, Tuple
+from typing import Optional, Tuple, List, Dict, Any
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from more_itertools import chunked
 from src.utils.logger import logger
-from src.utils.config import S3_BUCKET
+from src.utils.metrics import metrics
+from src.utils.config import S3_BUCKET, S3_ARCHIVE_WORKERS
 
-def get_latest_processed_file(s3_client, prefix: str = "processed_data/") -> Tuple[Optional[str], Optional[bytes]]:
-    """Retrieve the latest processed CSV file from S3"""
+S3_DELETE_BATCH_SIZE = 1000  # Hard limit of DeleteObjects
+PROCESSED_EXTENSIONS = (".parquet", ".csv")
+ARCHIVE_MANIFEST_PREFIX = "archive/manifests/"
+
+def list_processed_keys(s3_client, prefix: str = "processed_data/") -> List[str]:
+    """List pending processed Parquet or CSV files, oldest first"""
     try:
         paginator = s3_client.get_paginator('list_objects_v2')
-        latest_obj = None
-        
+        objects = []
         for page in paginator.paginate(Bucket=S3_BUCKET, Prefix=prefix):
-            if "Contents" not in page:
-                continue
-            page_latest = max(page["Contents"], key=lambda x: x["LastModified"])
-            if not latest_obj or page_latest["LastModified"] > latest_obj["LastModified"]:
-                latest_obj = page_latest
+            objects.extend(
+                obj for obj in page.get("Contents", [])
+                if obj["Key"].endswith(PROCESSED_EXTENSIONS)
+            )
+        return [obj["Key"] for obj in sorted(objects, key=lambda x: x["LastModified"])]
 
-        if not latest_obj:
-            logger.warning("No processed data found in S3.")
-            return None, None
-
-        latest_key = latest_obj["Key"]
-        if not latest_key.endswith(".csv"):
-            logger.warning(f"Latest file is not a CSV: {latest_key}")
-            return None, None
+    except Exception as e:
+        logger.error(f"Error accessing S3: {str(e)}")
+        return []
 
-        logger.info(f"Downloading {latest_key}...")
-        response = s3_client.get_object(Bucket=S3_BUCKET, Key=latest_key)
-        return latest_key, response["Body"].read()
+def download_processed_file(s3_client, key: str) -> Optional[bytes]:
+    """Download one processed file"""
+    try:
+        logger.info(f"Downloading {key}...")
+        response = s3_client.get_object(Bucket=S3_BUCKET, Key=key)
+        body = response["Body"].read()
+        metrics.inc("s3_bytes_total", len(body), direction="download")
+        return body
 
     except Exception as e:
-        logger.error(f"Error accessing S3: {str(e)}")
+        logger.error(f"Error downloading {key}: {str(e)}")
+        return None
+
+def get_latest_processed_file(s3_client, prefix: str = "processed_data/") -> Tuple[Optional[str], Optional[bytes]]:
+    """Retrieve the latest processed Parquet or CSV file from S3"""
+    keys = list_processed_keys(s3_client, prefix)
+    if not keys:
+        logger.warning("No processed data found in S3.")
         return None, None
+    return keys[-1], download_processed_file(s3_client, keys[-1])
 
-def archive_file(s3_client, latest_key: str) -> bool:
-    """Archive processed file in S3"""
+def _archive_key_for(key: str) -> str:
+    """Map a processed_data/ key to its archive/ location"""
+    return key.replace("processed_data/", "archive/", 1)
+
+def _copy_to_archive(s3_client, key: str) -> Tuple[str, Optional[str]]:
+    """Copy one object into archive/, returning (key, error)"""
     try:
-        archive_key = latest_key.replace("processed_data/", "archive/", 1)
         s3_client.copy_object(
-            CopySource={"Bucket": S3_BUCKET, "Key": latest_key},
+            CopySource={"Bucket": S3_BUCKET, "Key": key},
             Bucket=S3_BUCKET,
-            Key=archive_key,
+            Key=_archive_key_for(key),
             MetadataDirective="COPY"
         )
-        s3_client.delete_object(Bucket=S3_BUCKET, Key=latest_key)
-        logger.info(f"Successfully archived to {archive_key}")
-        return True
+        return key, None
+    except Exception as e:
+        return key, str(e)
+
+def _delete_in_batches(s3_client, keys: List[str]) -> List[str]:
+    """Remove keys with DeleteObjects, returning keys that failed to delete"""
+    failed = []
+    for batch in chunked(keys, S3_DELETE_BATCH_SIZE):
+        response = s3_client.delete_objects(
+            Bucket=S3_BUCKET,
+            Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+        )
+        for error in response.get("Errors", []):
+            logger.error(f"Failed to delete {error.get('Key')}: {error.get('Message')}")
+            failed.append(error.get("Key"))
+    return failed
+
+def _write_manifest(s3_client, manifest: Dict[str, Any]) -> str:
+    """Persist an archive manifest next to the archived files, returning its key"""
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
+    manifest_key = f"{ARCHIVE_MANIFEST_PREFIX}archive_{timestamp}.json"
+    s3_client.put_object(
+        Bucket=S3_BUCKET,
+        Key=manifest_key,
+        Body=json.dumps(manifest, indent=2).encode("utf-8"),
+        ContentType="application/json"
+    )
+    return manifest_key
+
+def archive_files(s3_client, keys: List[str], max_workers: int = S3_ARCHIVE_WORKERS) -> Dict[str, Any]:
+    """
+    Archive many processed files in S3.
+
+    Copies run concurrently on the shared client, originals are removed with
+    DeleteObjects in batches of up to 1000 keys, and a manifest listing what
+    moved is written under archive/manifests/. Only successfully copied keys
+    are deleted.
+
+    Returns:
+        The manifest dictionary (archived, failed and manifest_key)
+    """
+    manifest = {
+        "archived_at": datetime.now(timezone.utc).isoformat(),
+        "archived": [],
+        "failed": []
+    }
+    if not keys:
+        return {**manifest, "manifest_key": None}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(keys)))) as executor:
+        results = list(executor.map(lambda key: _copy_to_archive(s3_client, key), keys))
+
+    copied = []
+    for key, error in results:
+        if error:
+            logger.error(f"Archiving failed for {key}: {error}")
+            manifest["failed"].append({"key": key, "error": error})
+        else:
+            copied.append(key)
+
+    try:
+        delete_failures = set(_delete_in_batches(s3_client, copied))
     except Exception as e:
-        logger.error(f"Archiving failed: {str(e)}")
-        return False
\ No newline at end of file
+        logger.error(f"Bulk delete failed: {str(e)}")
+        delete_failures = set(copied)
+
+    for key in copied:
+        if key in delete_failures:
+            manifest["failed"].append({"key": key, "error": "delete failed"})
+        else:
+            manifest["archived"].append({"source": key, "destination": _archive_key_for(key)})
+
+    manifest_key = None
+    try:
+        manifest_key = _write_manifest(s3_client, manifest)
+    except Exception as e:
+        logger.error(f"Failed to write archive manifest: {str(e)}")
+    # Where the manifest landed is reported to the caller, not stored in the manifest itself
+    manifest["manifest_key"] = manifest_key
+
+    metrics.inc("s3_objects_archived_total", len(manifest["archived"]))
+    logger.info(f"Archived {len(manifest['archived'])}/{len(keys)} files")
+    return manifest
+
+def archive_file(s3_client, latest_key: str) -> bool:
+    """Archive processed file in S3"""
+    manifest = archive_files(s3_client, [latest_key])
+    if manifest["failed"]:
+        return False
+    logger.info(f"Successfully archived to {_archive_key_for(latest_key)}")
+    return True
\ No newline at end of file
@@ -0,0 +1,133 @@
+from psycopg2.extras import execute_values
+from src.jobs.processors.salary_normalizer import normalize_salary
+from src.utils.logger import logger
+
+# Columns added to job_data after the original table definition
+JOB_DATA_COLUMN_DDL = [
+    "ALTER TABLE job_data ADD COLUMN IF NOT EXISTS job_salary_currency TEXT",
+    "ALTER TABLE job_data ADD COLUMN IF NOT EXISTS job_annual_min_salary NUMERIC",
+    "ALTER TABLE job_data ADD COLUMN IF NOT EXISTS job_annual_max_salary NUMERIC",
+]
+
+# Indexes backing the dashboard's list queries
+JOB_DATA_INDEX_DDL = [
+    # Keyset pagination walks (date_posted, job_hash) newest first
+    """
+    CREATE INDEX IF NOT EXISTS idx_job_data_date_posted_hash
+    ON job_data (date_posted DESC NULLS LAST, job_hash DESC)
+    """,
+    # Fallback data version for readers when the version row is missing
+    "CREATE INDEX IF NOT EXISTS idx_job_data_integrated_timestamp ON job_data (integrated_timestamp)",
+    # Min-salary filter is a range scan within one currency
+    """
+    CREATE INDEX IF NOT EXISTS idx_job_data_annual_max_salary
+    ON job_data (job_salary_currency, job_annual_max_salary)
+    """,
+]
+
+DATA_VERSION_DDL = """
+    CREATE TABLE IF NOT EXISTS job_data_version (
+        id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+        version BIGINT NOT NULL,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    )
+"""
+
+# One-off data migrations that have already run, so they are not repeated per process
+MIGRATIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS job_data_migrations (
+        name TEXT PRIMARY KEY,
+        applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    )
+"""
+
+SALARY_BACKFILL_MIGRATION = "annual_salaries"
+SALARY_BACKFILL_BATCH_SIZE = 1000
+
+# Rows loaded before the normalized salary columns existed
+SALARY_BACKFILL_QUERY = """
+    SELECT job_hash, date_posted, job_salary::float8, job_min_salary::float8, job_max_salary::float8, job_country
+    FROM job_data
+    WHERE job_salary_currency IS NULL
+      AND (job_min_salary IS NOT NULL OR job_max_salary IS NOT NULL OR job_salary IS NOT NULL)
+"""
+
+SALARY_BACKFILL_UPDATE = """
+    UPDATE job_data j
+    SET job_salary_currency = v.currency,
+        job_annual_min_salary = v.annual_min,
+        job_annual_max_salary = v.annual_max
+    FROM (VALUES %s) AS v(job_hash, date_posted, currency, annual_min, annual_max)
+    WHERE j.job_hash = v.job_hash AND j.date_posted IS NOT DISTINCT FROM v.date_posted
+"""
+
+_schema_ready = False
+
+def claim_migration(cursor, name: str) -> bool:
+    """Record a one-off migration as applied in this transaction; False if it already was"""
+    cursor.execute(MIGRATIONS_DDL)
+    cursor.execute(
+        "INSERT INTO job_data_migrations (name) VALUES (%s) ON CONFLICT (name) DO NOTHING RETURNING name",
+        (name,)
+    )
+    return cursor.fetchone() is not None
+
+def backfill_annual_salaries(cursor, batch_size: int = SALARY_BACKFILL_BATCH_SIZE) -> int:
+    """
+    Normalize salaries of rows loaded before the annual salary columns existed.
+
+    Runs once per database: the migration marker commits with the updates, so
+    rows without a recognisable currency (left NULL, as on load) are not
+    rescanned by every new process. Rows stream through a server-side cursor.
+    """
+    if not claim_migration(cursor, SALARY_BACKFILL_MIGRATION):
+        return 0
+
+    updated = 0
+    with cursor.connection.cursor(name="salary_backfill_scan") as source:
+        source.itersize = batch_size
+        source.execute(SALARY_BACKFILL_QUERY)
+        while True:
+            rows = source.fetchmany(batch_size)
+            if not rows:
+                break
+            updates = []
+            for job_hash, date_posted, salary, min_salary, max_salary, country in rows:
+                normalized = normalize_salary({
+                    "job_salary": salary,
+                    "job_min_salary": min_salary,
+                    "job_max_salary": max_salary,
+                    "job_country": country,
+                })
+                if normalized.currency is not None:
+                    updates.append((job_hash, date_posted, normalized.currency, normalized.annual_min, normalized.annual_max))
+            if updates:
+                execute_values(cursor, SALARY_BACKFILL_UPDATE, updates,
+                               template="(%s, %s::timestamp, %s, %s::numeric, %s::numeric)", page_size=batch_size)
+                updated += len(updates)
+    logger.info(f"Backfilled normalized salaries for {updated} existing jobs")
+    return updated
+
+def ensure_job_data_schema(cursor) -> None:
+    """Create added columns, dashboard indexes and the data version table if missing, and backfill salaries"""
+    if _schema_ready:
+        return
+    for statement in JOB_DATA_COLUMN_DDL + JOB_DATA_INDEX_DDL:
+        cursor.execute(statement)
+    backfill_annual_salaries(cursor)
+    cursor.execute(DATA_VERSION_DDL)
+    logger.info("job_data schema verified")
+
+def mark_job_data_schema_ready() -> None:
+    """Skip the schema checks from now on; call once the DDL has committed"""
+    global _schema_ready
+    _schema_ready = True
+
+def bump_data_version(cursor) -> None:
+    """Advance the single-row data version so dashboard caches invalidate"""
+    cursor.execute("""
+        INSERT INTO job_data_version (id, version, updated_at)
+        VALUES (1, 1, NOW())
+        ON CONFLICT (id)
+        DO UPDATE SET version = job_data_version.version + 1, updated_at = NOW()
+    """)
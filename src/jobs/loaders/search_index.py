@@ -0,0 +1,48 @@
+from src.utils.logger import logger
+
+SEARCH_CONFIG = "english"
+
+# Title outranks employer, which outranks the long description text
+SEARCH_VECTOR_EXPRESSION = f"""
+    setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(job_title, '')), 'A') ||
+    setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(employer_name, '')), 'B') ||
+    setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(job_highlights, '')), 'C') ||
+    setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(job_description, '')), 'D')
+"""
+
+# Postgres computes the vector as part of each insert/update, so there is no second write per row
+SEARCH_SCHEMA_DDL = [
+    f"""
+    ALTER TABLE job_data ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_job_data_search_vector ON job_data USING GIN (search_vector)",
+]
+
+_schema_ready = False
+
+def _has_plain_search_column(cursor) -> bool:
+    """Whether search_vector exists as an ordinary column from before it was generated"""
+    cursor.execute("""
+        SELECT is_generated = 'NEVER'
+        FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'job_data' AND column_name = 'search_vector'
+    """)
+    row = cursor.fetchone()
+    return bool(row and row[0])
+
+def ensure_search_schema(cursor) -> None:
+    """Create the generated weighted search column and its GIN index if missing"""
+    if _schema_ready:
+        return
+    if _has_plain_search_column(cursor):
+        # A plain column cannot be turned into a generated one in place; its index goes with it
+        logger.info("Replacing search_vector with a generated column")
+        cursor.execute("ALTER TABLE job_data DROP COLUMN search_vector")
+    for statement in SEARCH_SCHEMA_DDL:
+        cursor.execute(statement)
+
+def mark_search_schema_ready() -> None:
+    """Skip the schema checks from now on; call once the DDL has committed"""
+    global _schema_ready
+    _schema_ready = True
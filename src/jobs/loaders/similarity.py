@@ -0,0 +1,245 @@
+import hashlib
+import heapq
+import math
+import re
+import zlib
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Tuple
+from psycopg2.extras import execute_values
+from src.clients.postgres_client import PostgresClient
+from src.jobs.processors.data_processor import REQUIRED_COLUMNS
+from src.utils.config import SIMILAR_JOBS_TOP_K, SIMILARITY_FEATURES, SIMILARITY_MIN_SCORE
+from src.utils.logger import logger
+
+if TYPE_CHECKING:
+    from scipy import sparse
+
+SIMILARITY_BATCH_SIZE = 512  # Changed rows per sparse matrix product
+SIMILARITY_CHUNK_ROWS = 20000  # Stored vectors held in memory at once
+
+# Field weights: a matching title says more than a matching bullet point
+FIELD_WEIGHTS = {
+    "job_title": 3.0,
+    "job_description": 1.0,
+    "job_highlights": 1.5,
+}
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the "
+    "their this to was we will with you your".split()
+)
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+SIMILARITY_SCHEMA_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS job_vectors (
+        job_hash TEXT PRIMARY KEY,
+        content_hash TEXT NOT NULL,
+        indices INTEGER[] NOT NULL,
+        weights REAL[] NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS job_similar (
+        job_hash TEXT NOT NULL,
+        similar_hash TEXT NOT NULL,
+        score REAL NOT NULL,
+        PRIMARY KEY (job_hash, similar_hash)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_job_similar_lookup ON job_similar (job_hash, score DESC)",
+]
+
+def _tokens(text: str) -> List[str]:
+    """Lowercased word unigrams and bigrams without stop words"""
+    words = [w for w in TOKEN_PATTERN.findall((text or "").lower()) if w not in STOP_WORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+def vectorize(fields: Dict[str, str], n_features: int = SIMILARITY_FEATURES) -> Tuple[List[int], List[float]]:
+    """
+    Hash a job's text fields into an L2-normalized sparse vector.
+
+    Hashing needs no shared vocabulary, so each job's vector depends only on
+    its own text and can be computed incrementally.
+    """
+    counts: Counter = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for token, count in Counter(_tokens(fields.get(field))).items():
+            # Sublinear term frequency keeps long descriptions from dominating
+            counts[zlib.crc32(f"{field[:5]}:{token}".encode("utf-8")) % n_features] += weight * (1 + math.log(count))
+    norm = math.sqrt(sum(v * v for v in counts.values()))
+    if not norm:
+        return [], []
+    indices = sorted(counts)
+    return indices, [counts[i] / norm for i in indices]
+
+def content_hash(fields: Dict[str, str]) -> str:
+    """Fingerprint of the text a vector is built from"""
+    text = "\x1f".join(fields.get(field) or "" for field in FIELD_WEIGHTS)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def ensure_similarity_schema(cursor) -> None:
+    """Create the vector and neighbor tables if missing"""
+    for statement in SIMILARITY_SCHEMA_DDL:
+        cursor.execute(statement)
+
+def _changed_jobs(cursor, data: List[Tuple]) -> Dict[str, Tuple[str, Dict[str, str]]]:
+    """Return job_hash -> (content_hash, fields) for new or edited jobs in the batch"""
+    hash_index = REQUIRED_COLUMNS.index("job_hash")
+    field_indexes = {field: REQUIRED_COLUMNS.index(field) for field in FIELD_WEIGHTS}
+    batch = {}
+    for row in data:
+        fields = {field: row[i] if isinstance(row[i], str) else "" for field, i in field_indexes.items()}
+        batch[row[hash_index]] = (content_hash(fields), fields)
+
+    cursor.execute(
+        "SELECT job_hash, content_hash FROM job_vectors WHERE job_hash = ANY(%s)",
+        (list(batch),)
+    )
+    known = dict(cursor.fetchall())
+    return {job_hash: item for job_hash, item in batch.items() if known.get(job_hash) != item[0]}
+
+def _csr_matrix(rows: List[Tuple[List[int], List[float]]], n_features: int) -> "sparse.csr_matrix":
+    """Build a CSR matrix from (indices, weights) rows"""
+    import numpy as np
+    from scipy import sparse
+    indptr, indices, weights = [0], [], []
+    for row_indices, row_weights in rows:
+        indices.extend(row_indices)
+        weights.extend(row_weights)
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.asarray(weights, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+        shape=(len(rows), n_features)
+    )
+
+def _iter_vector_chunks(conn, n_features: int, chunk_rows: int = SIMILARITY_CHUNK_ROWS) -> Iterator[Tuple[List[str], "sparse.csr_matrix"]]:
+    """Stream stored vectors through a server-side cursor, one CSR chunk at a time"""
+    with conn.cursor(name="job_vectors_scan") as cursor:
+        cursor.itersize = chunk_rows
+        cursor.execute("SELECT job_hash, indices, weights FROM job_vectors")
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            yield [row[0] for row in rows], _csr_matrix([(row[1], row[2]) for row in rows], n_features)
+
+def _kth_scores(cursor, job_hashes: Iterable[str]) -> Dict[str, Tuple[int, float]]:
+    """Current neighbor count and weakest kept score of the given jobs"""
+    cursor.execute(
+        "SELECT job_hash, COUNT(*), MIN(score) FROM job_similar WHERE job_hash = ANY(%s) GROUP BY job_hash",
+        (list(job_hashes),)
+    )
+    return {job_hash: (count, score) for job_hash, count, score in cursor.fetchall()}
+
+def _neighbor_pairs(conn, cursor, changed_hashes: List[str], changed_matrix, k: int, min_score: float) -> List[Tuple[str, str, float]]:
+    """Score changed jobs against every stored vector, chunk by chunk, and collect unique (job, neighbor, score) pairs"""
+    best: Dict[str, List[Tuple[float, str]]] = {job_hash: [] for job_hash in changed_hashes}
+    # Two changed jobs produce each pair both forwards and in reverse; keep one
+    pairs: Dict[Tuple[str, str], float] = {}
+    for chunk_hashes, chunk in _iter_vector_chunks(conn, changed_matrix.shape[1]):
+        chunk_t = chunk.T.tocsr()
+        candidates = []
+        for start in range(0, len(changed_hashes), SIMILARITY_BATCH_SIZE):
+            scores = (changed_matrix[start:start + SIMILARITY_BATCH_SIZE] @ chunk_t).tocsr()
+            for offset in range(scores.shape[0]):
+                source = changed_hashes[start + offset]
+                begin, end = scores.indptr[offset], scores.indptr[offset + 1]
+                matches = [
+                    (float(val), chunk_hashes[col])
+                    for col, val in zip(scores.indices[begin:end], scores.data[begin:end])
+                    if val >= min_score and chunk_hashes[col] != source
+                ]
+                if matches:
+                    best[source] = heapq.nlargest(k, best[source] + matches)
+                    candidates.extend((neighbor, source, score) for score, neighbor in matches)
+
+        # The changed job may also displace the weakest neighbor of existing jobs
+        thresholds = _kth_scores(cursor, {neighbor for neighbor, _, _ in candidates})
+        for neighbor, source, score in candidates:
+            count, weakest = thresholds.get(neighbor, (0, 0.0))
+            if count < k or score > weakest:
+                pairs[(neighbor, source)] = score
+
+    for source, top in best.items():
+        for score, neighbor in top:
+            pairs[(source, neighbor)] = score
+    return [(job, neighbor, score) for (job, neighbor), score in pairs.items()]
+
+def refresh_similar_jobs(data: List[Tuple], k: int = SIMILAR_JOBS_TOP_K) -> int:
+    """
+    Re-vectorize new or changed jobs and update the top-k neighbor table.
+
+    Only jobs whose title, summary or qualifications changed are re-hashed;
+    their neighbors are recomputed with batched sparse products against the
+    stored vectors, streamed in chunks so memory stays bounded as the table
+    grows, and existing jobs pick them up when they beat their current k-th
+    neighbor. Returns the number of jobs re-vectorized.
+    """
+    conn = None
+    try:
+        conn = PostgresClient.get_connection()
+        with conn, conn.cursor() as cursor:
+            ensure_similarity_schema(cursor)
+            changed = _changed_jobs(cursor, data)
+            if not changed:
+                logger.info("No new or changed jobs to vectorize")
+                return 0
+
+            vectors = []
+            for job_hash, (digest, fields) in changed.items():
+                indices, weights = vectorize(fields)
+                vectors.append((job_hash, digest, indices, weights))
+            execute_values(cursor, """
+                INSERT INTO job_vectors (job_hash, content_hash, indices, weights)
+                VALUES %s
+                ON CONFLICT (job_hash) DO UPDATE SET
+                    content_hash = EXCLUDED.content_hash,
+                    indices = EXCLUDED.indices,
+                    weights = EXCLUDED.weights
+            """, vectors, template="(%s, %s, %s::integer[], %s::real[])")
+
+            # Drop vectors of jobs that left job_data and stale pairs of changed jobs
+            cursor.execute("""
+                DELETE FROM job_vectors v
+                WHERE NOT EXISTS (SELECT 1 FROM job_data j WHERE j.job_hash = v.job_hash)
+            """)
+            cursor.execute("""
+                DELETE FROM job_similar
+                WHERE job_hash = ANY(%(hashes)s) OR similar_hash = ANY(%(hashes)s)
+                   OR NOT EXISTS (SELECT 1 FROM job_vectors v WHERE v.job_hash = job_similar.similar_hash)
+            """, {"hashes": list(changed)})
+
+            changed_matrix = _csr_matrix([(indices, weights) for _, _, indices, weights in vectors], SIMILARITY_FEATURES)
+            pairs = _neighbor_pairs(
+                conn, cursor, [vector[0] for vector in vectors], changed_matrix, k, SIMILARITY_MIN_SCORE
+            )
+
+            if pairs:
+                execute_values(cursor, """
+                    INSERT INTO job_similar (job_hash, similar_hash, score)
+                    VALUES %s
+                    ON CONFLICT (job_hash, similar_hash) DO UPDATE SET score = EXCLUDED.score
+                """, pairs, page_size=1000)
+                # Keep only the k best neighbors for every job that gained candidates
+                cursor.execute("""
+                    DELETE FROM job_similar s
+                    USING (
+                        SELECT job_hash, similar_hash,
+                               ROW_NUMBER() OVER (PARTITION BY job_hash ORDER BY score DESC) AS rn
+                        FROM job_similar
+                        WHERE job_hash = ANY(%s)
+                    ) ranked
+                    WHERE s.job_hash = ranked.job_hash
+                      AND s.similar_hash = ranked.similar_hash
+                      AND ranked.rn > %s
+                """, (list({pair[0] for pair in pairs}), k))
+
+            logger.info(f"Vectorized {len(changed)} jobs; stored {len(pairs)} neighbor candidates")
+            return len(changed)
+    except Exception as e:
+        logger.error(f"Failed to refresh similar jobs: {str(e)}")
+        raise
+    finally:
+        if conn:
+            PostgresClient.release_connection(conn)
@@ -0,0 +1,113 @@
+from typing import List, Tuple
+from src.clients.postgres_client import PostgresClient
+from src.jobs.processors.data_processor import REQUIRED_COLUMNS
+from src.utils.logger import logger
+
+# Whitespace trimmed from filter values, identically in Python and SQL
+TRIM_CHARS = " \t\r\n"
+
+def _normalized(column: str) -> str:
+    """SQL expression trimming a column the way _batch_values trims loaded values"""
+    return f"btrim({column}, E' \\t\\r\\n')"
+
+TYPEAHEAD_SCHEMA_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE TABLE IF NOT EXISTS job_filter_values (
+        kind TEXT NOT NULL,
+        value TEXT NOT NULL,
+        job_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (kind, value)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_job_filter_values_trgm ON job_filter_values USING GIN (value gin_trgm_ops)",
+    # Let the dashboard's ILIKE '%x%' filters use an index instead of a scan
+    "CREATE INDEX IF NOT EXISTS idx_job_data_location_trgm ON job_data USING GIN (job_location gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_job_data_city_trgm ON job_data USING GIN (job_city gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_job_data_employer_trgm ON job_data USING GIN (employer_name gin_trgm_ops)",
+    # Equality lookups used when recounting a value
+    f"CREATE INDEX IF NOT EXISTS idx_job_data_location_trimmed ON job_data ({_normalized('job_location')})",
+    f"CREATE INDEX IF NOT EXISTS idx_job_data_city_trimmed ON job_data ({_normalized('job_city')})",
+    f"CREATE INDEX IF NOT EXISTS idx_job_data_employer_trimmed ON job_data ({_normalized('employer_name')})",
+]
+
+# kind -> (job_data columns the value may appear in)
+FILTER_VALUE_SOURCES = {
+    "location": ("job_location", "job_city"),
+    "employer": ("employer_name",),
+}
+
+_schema_ready = False
+
+def ensure_typeahead_schema(cursor) -> None:
+    """Create pg_trgm, the distinct-values table and trigram indexes if missing"""
+    if _schema_ready:
+        return
+    for statement in TYPEAHEAD_SCHEMA_DDL:
+        cursor.execute(statement)
+
+def mark_typeahead_schema_ready() -> None:
+    """Skip the schema checks from now on; call once the DDL has committed"""
+    global _schema_ready
+    _schema_ready = True
+
+def _batch_values(data: List[Tuple], columns: Tuple[str, ...]) -> List[str]:
+    """Collect distinct non-empty values of the given columns from loaded rows"""
+    indexes = [REQUIRED_COLUMNS.index(col) for col in columns]
+    return sorted({
+        row[i].strip(TRIM_CHARS) for row in data for i in indexes
+        if isinstance(row[i], str) and row[i].strip(TRIM_CHARS)
+    })
+
+def refresh_filter_values(cursor, data: List[Tuple]) -> None:
+    """Recount the distinct filter values touched by a loaded batch"""
+    for kind, columns in FILTER_VALUE_SOURCES.items():
+        values = _batch_values(data, columns)
+        if not values:
+            continue
+        match = " OR ".join(f"{_normalized('j.' + col)} = v.value" for col in columns)
+        cursor.execute(f"""
+            INSERT INTO job_filter_values (kind, value, job_count)
+            SELECT %s, v.value, (SELECT COUNT(*) FROM job_data j WHERE {match})
+            FROM unnest(%s::text[]) AS v(value)
+            ON CONFLICT (kind, value)
+            DO UPDATE SET job_count = EXCLUDED.job_count
+        """, (kind, values))
+        logger.info(f"Refreshed {len(values)} {kind} typeahead values")
+
+def recount_filter_values() -> None:
+    """
+    Recount every filter value from job_data after a load.
+
+    Per-batch refreshes only touch values present in the batch, so counts
+    for values that retention or deletes removed would otherwise never drop.
+    Values no longer present are deleted.
+    """
+    conn = None
+    try:
+        conn = PostgresClient.get_connection()
+        with conn, conn.cursor() as cursor:
+            for kind, columns in FILTER_VALUE_SOURCES.items():
+                candidates = ", ".join(_normalized(f"j.{col}") for col in columns)
+                cursor.execute("UPDATE job_filter_values SET job_count = 0 WHERE kind = %s", (kind,))
+                cursor.execute(f"""
+                    INSERT INTO job_filter_values (kind, value, job_count)
+                    SELECT %s, v.value, COUNT(*)
+                    FROM job_data j
+                    CROSS JOIN LATERAL (
+                        SELECT DISTINCT x FROM unnest(ARRAY[{candidates}]) AS x WHERE x <> ''
+                    ) AS v(value)
+                    GROUP BY v.value
+                    ON CONFLICT (kind, value)
+                    DO UPDATE SET job_count = EXCLUDED.job_count
+                """, (kind,))
+                cursor.execute("DELETE FROM job_filter_values WHERE kind = %s AND job_count = 0", (kind,))
+                if cursor.rowcount:
+                    logger.info(f"Removed {cursor.rowcount} stale {kind} typeahead values")
+        logger.info("Recounted typeahead values")
+    except Exception as e:
+        logger.error(f"Failed to recount typeahead values: {str(e)}")
+        raise
+    finally:
+        if conn:
+            PostgresClient.release_connection(conn)
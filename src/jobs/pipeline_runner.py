@@ -0,0 +1,175 @@
+# src/jobs/pipeline_runner.py
+
+import asyncio
+import math
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+from more_itertools import chunked
+
+from src.clients.s3_client import get_s3_client
+from src.jobs.fetch_jobs import fetch_scheduled_jobs, upload_to_s3, DEFAULT_QUERY_PARAMS
+from src.jobs.query_scheduler import QueryScheduler, load_targets
+from src.jobs.process_jobs import process_job_batch, upload_processed_batch, MAX_CONCURRENT_TASKS
+from src.jobs.load_to_postgresql import update_database, finalize_load, run_maintenance
+from src.jobs.loaders.s3_loader import archive_files
+from src.jobs.loaders.similarity import refresh_similar_jobs
+from src.jobs.processors.data_processor import jobs_to_rows
+from src.utils.config import (
+    RAPIDAPI_KEY, RAPIDAPI_HOST, S3_BUCKET,
+    PIPELINE_CHANNEL_SIZE, PIPELINE_BATCH_SIZE, PROCESSED_FORMAT
+)
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.profiling import profiler
+
+_END = object()  # End-of-stream marker passed down each channel
+
+class StreamingPipeline:
+    """
+    Runs fetch, process and load as concurrent stages joined by bounded queues.
+
+    Each scheduled query's new listings are split into small batches that flow straight into
+    OpenAI processing and then into Postgres, so loading starts as soon as the
+    first batch is enriched. Several batches are enriched at once under one
+    shared semaphore, so OpenAI concurrency matches the sequential mode. Raw payloads and processed CSVs are still written
+    to S3 by background tasks for durability; processed files are archived
+    once their rows are loaded, since no separate load pass needs them.
+    """
+
+    def __init__(
+        self,
+        s3_client=None,
+        params: Optional[Dict[str, Any]] = None,
+        channel_size: int = PIPELINE_CHANNEL_SIZE,
+        batch_size: int = PIPELINE_BATCH_SIZE
+    ):
+        self.s3 = s3_client or get_s3_client()
+        self.params = {**DEFAULT_QUERY_PARAMS, **(params or {})}
+        self.channel_size = channel_size
+        self.batch_size = batch_size
+        # Enough batches in flight to keep every semaphore slot busy
+        self.batches_in_flight = math.ceil(MAX_CONCURRENT_TASKS / batch_size) + 1
+        self.run_id = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        self.stats = {"fetched": 0, "processed": 0, "loaded": 0}
+        self._persist_tasks: List[asyncio.Task] = []
+        self._processed_keys: List[str] = []
+
+    def _persist(self, func, *args) -> asyncio.Task:
+        """Write to S3 in a worker thread without blocking the stage"""
+        task = asyncio.create_task(asyncio.to_thread(func, *args))
+        self._persist_tasks.append(task)
+        return task
+
+    async def fetch_stage(self, out: asyncio.Queue) -> None:
+        """Fetch each scheduled query and emit its new listings in batches"""
+        scheduler = QueryScheduler(load_targets(self.params))
+        await asyncio.to_thread(scheduler.load)
+        try:
+            for index, state in enumerate(scheduler.plan()):
+                try:
+                    jobs = await asyncio.to_thread(fetch_scheduled_jobs, scheduler, state)
+                except Exception:
+                    logger.error(f"Query {state.params.get('query')!r} failed", exc_info=True)
+                    continue
+                if not jobs:
+                    continue
+                self.stats["fetched"] += len(jobs)
+                self._persist(upload_to_s3, {"data": jobs}, S3_BUCKET, f"_q{index}")
+                for batch in chunked(jobs, self.batch_size):
+                    await out.put(list(batch))
+        finally:
+            await asyncio.to_thread(scheduler.save)
+        await out.put(_END)
+
+    async def _process_batch(self, batch: List[dict], semaphore: asyncio.Semaphore, out: asyncio.Queue) -> None:
+        """Enrich one raw batch and hand it to the loader"""
+        processed = await process_job_batch(batch, semaphore)
+        if not processed:
+            return
+        self.stats["processed"] += len(processed)
+        upload_key = f"processed_data/jobs_{self.run_id}_{self.stats['processed']}.{PROCESSED_FORMAT}"
+        self._processed_keys.append(upload_key)
+        self._persist(upload_processed_batch, self.s3, processed, upload_key)
+        await out.put(processed)
+
+    async def process_stage(self, inp: asyncio.Queue, out: asyncio.Queue) -> None:
+        """Enrich raw batches concurrently under one shared semaphore"""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_TASKS)
+        in_flight: Set[asyncio.Task] = set()
+        try:
+            while (batch := await inp.get()) is not _END:
+                if len(in_flight) >= self.batches_in_flight:
+                    done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
+                in_flight.add(asyncio.create_task(self._process_batch(batch, semaphore, out)))
+            await asyncio.gather(*in_flight)
+        except BaseException:
+            for task in in_flight:
+                task.cancel()
+            raise
+        await out.put(_END)
+
+    async def load_stage(self, inp: asyncio.Queue) -> None:
+        """Upsert each enriched batch, then refresh neighbors and run post-load maintenance once"""
+        loaded_rows = []
+        while (processed := await inp.get()) is not _END:
+            rows = jobs_to_rows(processed)
+            self.stats["loaded"] += await asyncio.to_thread(update_database, rows)
+            loaded_rows.extend(rows)
+        if self.stats["loaded"]:
+            await asyncio.to_thread(run_maintenance, "similarity", refresh_similar_jobs, loaded_rows)
+            await asyncio.to_thread(finalize_load, self.s3)
+
+    async def _staged(self, stage_name: str, stat: str, coro) -> None:
+        """Run a stage coroutine under the stage timer"""
+        with metrics.stage(stage_name) as stage:
+            try:
+                await coro
+            finally:
+                stage.records = self.stats[stat]
+
+    @profiler.profiled("streaming")
+    async def run(self) -> Dict[str, int]:
+        """Run all stages concurrently and wait for background persistence"""
+        started = time.monotonic()
+        raw_channel = asyncio.Queue(maxsize=self.channel_size)
+        processed_channel = asyncio.Queue(maxsize=self.channel_size)
+        stages = [
+            asyncio.create_task(self._staged("fetch", "fetched", self.fetch_stage(raw_channel))),
+            asyncio.create_task(self._staged("process", "processed", self.process_stage(raw_channel, processed_channel))),
+            asyncio.create_task(self._staged("load", "loaded", self.load_stage(processed_channel))),
+        ]
+        try:
+            await asyncio.gather(*stages)
+        except Exception:
+            for stage in stages:
+                stage.cancel()
+            raise
+        finally:
+            results = await asyncio.gather(*self._persist_tasks, return_exceptions=True)
+
+        failures = [result for result in results if isinstance(result, Exception)]
+        if failures:
+            raise RuntimeError(f"{len(failures)} S3 persistence writes failed") from failures[0]
+
+        if self._processed_keys:
+            await asyncio.to_thread(archive_files, self.s3, self._processed_keys)
+
+        elapsed = time.monotonic() - started
+        metrics.set("pipeline_run_seconds", elapsed, mode="streaming")
+        logger.info(
+            f"Streaming pipeline finished in {elapsed:.1f}s - fetched {self.stats['fetched']}, "
+            f"processed {self.stats['processed']}, loaded {self.stats['loaded']}"
+        )
+        return self.stats
+
+def run_streaming_pipeline(s3_client=None, params: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+    """Entry point for the streaming fetch -> process -> load pipeline"""
+    if not all([RAPIDAPI_KEY, RAPIDAPI_HOST, S3_BUCKET]):
+        raise EnvironmentError("Missing required environment variables")
+    return asyncio.run(StreamingPipeline(s3_client, params).run())
+
+if __name__ == "__main__":
+    run_streaming_pipeline()
@@ -5,7 +5,6 @@ from datetime import datetime, timezone
 import json
 from io import BytesIO
 from typing import List, Optional, Dict, Any
-import pandas as pd
 from more_itertools import chunked
 
 from src.models.job_models import ProcessedJob
@@ -13,12 +12,14 @@ from src.jobs.processors.job_cleaner import clean_job_data
 from src.jobs.processors.job_parser import parse_job_data
 from src.utils.data_utils import generate_job_hash
 from src.clients.s3_client import get_s3_client
-from src.utils.config import S3_BUCKET
+from src.utils.config import S3_BUCKET, PROCESSED_FORMAT
 from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.profiling import profiler
 
 # Constants
 MAX_CONCURRENT_TASKS = 50  # Limit concurrent OpenAI API calls
-CSV_BATCH_SIZE = 1000      # Number of records per CSV buffer flush
+CSV_BATCH_SIZE = 1000      # Number of records per processed file
 
 async def process_job_async(
     raw_job: dict, 
@@ -53,21 +54,67 @@ async def process_job_async(
                 job_highlights=parsed_data.get("qualifications_needed", ""),
                 job_responsibilities=parsed_data.get("job_responsibilities", ""),
                 job_benefits=parsed_data.get("job_benefits", ""),
-                integrated_timestamp=datetime.now(timezone.utc)
+                integrated_timestamp=datetime.now(timezone.utc),
+                job_salary_currency=cleaned_job.get("job_salary_currency"),
+                job_annual_min_salary=cleaned_job.get("job_annual_min_salary"),
+                job_annual_max_salary=cleaned_job.get("job_annual_max_salary")
             )
         except Exception as e:
             job_id = raw_job.get("job_id", "unknown")
             logger.error(f"Failed to process job {job_id}: {str(e)}", exc_info=True)
             return None
 
-async def process_job_batch(jobs: List[dict]) -> List[ProcessedJob]:
-    """Process a batch of jobs with concurrency control"""
-    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TASKS)
+async def process_job_batch(jobs: List[dict], semaphore: Optional[asyncio.Semaphore] = None) -> List[ProcessedJob]:
+    """Process a batch of jobs with concurrency control; batches running together can share one semaphore"""
+    semaphore = semaphore or asyncio.Semaphore(MAX_CONCURRENT_TASKS)
     tasks = [process_job_async(job, semaphore) for job in jobs]
-    results = await asyncio.gather(*tasks)
-    return [job for job in results if job is not None]
+    with metrics.timer("process_batch_seconds"):
+        results = await asyncio.gather(*tasks)
+    processed = [job for job in results if job is not None]
+    metrics.inc("process_jobs_total", len(processed), outcome="ok")
+    metrics.inc("process_jobs_total", len(jobs) - len(processed), outcome="failed")
+    return processed
 
-async def process_and_upload(s3_client, jobs_data: List[dict], key: str) -> None:
+def processed_key_for(raw_key: str, suffix: int) -> str:
+    """Map a raw_data/ JSON key to the processed_data/ key for one batch"""
+    upload_key = raw_key.replace("raw_data/", "processed_data/")
+    return upload_key.replace(".json", f"_{suffix}.{PROCESSED_FORMAT}")
+
+def _serialize_csv(jobs: List[ProcessedJob]) -> bytes:
+    """Serialize a batch of processed jobs to quoted CSV"""
+    import pandas as pd
+
+    df = pd.DataFrame([job.__dict__ for job in jobs])
+    csv_buffer = BytesIO()
+    df.to_csv(
+        csv_buffer,
+        index=False,
+        encoding="utf-8",
+        escapechar="\\",
+        quoting=1
+    )
+    return csv_buffer.getvalue()
+
+def upload_processed_batch(s3_client, jobs: List[ProcessedJob], upload_key: str) -> str:
+    """Serialize a batch of processed jobs in the key's format and upload it to S3"""
+    if upload_key.endswith(".parquet"):
+        from src.jobs.processors.parquet_format import write_processed_parquet
+        body, content_type = write_processed_parquet(jobs), "application/vnd.apache.parquet"
+    else:
+        body, content_type = _serialize_csv(jobs), "text/csv"
+
+    # Upload to S3
+    s3_client.put_object(
+        Bucket=S3_BUCKET,
+        Key=upload_key,
+        Body=body,
+        ContentType=content_type
+    )
+    metrics.inc("s3_bytes_total", len(body), direction="upload")
+    logger.info(f"Uploaded batch {upload_key} with {len(jobs)} records")
+    return upload_key
+
+async def process_and_upload(s3_client, jobs_data: List[dict], key: str) -> int:
     """Process jobs and upload to S3 in batches"""
     processed_jobs = []
     
@@ -76,40 +123,18 @@ async def process_and_upload(s3_client, jobs_data: List[dict], key: str) -> None
         processed_jobs.extend(batch_result)
         
         if batch_result:
-            # Convert to DataFrame and validate
-            df = pd.DataFrame([job.__dict__ for job in batch_result])
-            
-            # Prepare CSV buffer
-            csv_buffer = BytesIO()
-            df.to_csv(
-                csv_buffer,
-                index=False,
-                encoding="utf-8",
-                escapechar="\\",
-                quoting=1
-            )
-            csv_buffer.seek(0)
-            
-            # Generate upload key
-            upload_key = key.replace("raw_data/", "processed_data/")
-            upload_key = upload_key.replace(".json", f"_{len(processed_jobs)}.csv")
-            
-            # Upload to S3
-            s3_client.put_object(
-                Bucket=S3_BUCKET,
-                Key=upload_key,
-                Body=csv_buffer.getvalue(),
-                ContentType="text/csv"
-            )
-            logger.info(f"Uploaded batch {upload_key} with {len(df)} records")
+            upload_processed_batch(s3_client, batch_result, processed_key_for(key, len(processed_jobs)))
 
     logger.info(f"Processing complete. Total jobs: {len(processed_jobs)}/{len(jobs_data)}")
+    return len(processed_jobs)
 
 async def fetch_raw_data(s3_client, key: str) -> List[dict]:
     """Fetch and validate raw data from S3"""
     try:
         response = s3_client.get_object(Bucket=S3_BUCKET, Key=key)
-        raw_data = json.loads(response["Body"].read())
+        body = response["Body"].read()
+        metrics.inc("s3_bytes_total", len(body), direction="download")
+        raw_data = json.loads(body)
         
         if not isinstance(raw_data.get("data"), list):
             raise ValueError("Invalid data format: expected list in 'data' field")
@@ -119,30 +144,33 @@ async def fetch_raw_data(s3_client, key: str) -> List[dict]:
         logger.error(f"Failed to fetch/parse raw data from {key}: {str(e)}")
         raise
 
+@profiler.profiled("process")
 async def main_async(s3_client=None) -> None:
     """Async main processing workflow"""
     s3 = s3_client or get_s3_client()
     
-    try:
-        # Find latest raw data file
-        response = s3.list_objects_v2(Bucket=S3_BUCKET, Prefix="raw_data/")
-        if not response.get("Contents"):
-            logger.warning("No raw data files found")
-            return
+    with metrics.stage("process") as stage:
+        try:
+            # Find latest raw data file
+            response = s3.list_objects_v2(Bucket=S3_BUCKET, Prefix="raw_data/")
+            if not response.get("Contents"):
+                logger.warning("No raw data files found")
+                return
 
-        # Get most recent file
-        latest_obj = max(response["Contents"], key=lambda x: x["LastModified"])
-        latest_key = latest_obj["Key"]
-        logger.info(f"Processing latest data file: {latest_key}")
+            # Get most recent file
+            latest_obj = max(response["Contents"], key=lambda x: x["LastModified"])
+            latest_key = latest_obj["Key"]
+            logger.info(f"Processing latest data file: {latest_key}")
 
-        # Process and upload
-        jobs_data = await fetch_raw_data(s3, latest_key)
-        await process_and_upload(s3, jobs_data, latest_key)
+            # Process and upload
+            jobs_data = await fetch_raw_data(s3, latest_key)
+            stage.records = await process_and_upload(s3, jobs_data, latest_key)
 
-    except Exception as e:
-        logger.error(f"Critical error in processing pipeline: {str(e)}", exc_info=True)
-        raise
+        except Exception as e:
+            logger.error(f"Critical error in processing pipeline: {str(e)}", exc_info=True)
+            raise
 
+@profiler.profiled("process")
 def process_jobs(s3_client=None) -> None:
     """Entry point with proper async handling"""
     try:
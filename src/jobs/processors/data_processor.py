@@ -1,28 +1,43 @@
-import pandas as pd
 from io import BytesIO
-from typing import List, Tuple
+from itertools import repeat
+from typing import TYPE_CHECKING, List, Tuple
 import logging
 from datetime import datetime, timezone
+from src.models.job_models import ProcessedJob
 from src.utils.logger import logger
+from src.utils.profiling import profiler
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 REQUIRED_COLUMNS = [
     "job_title", "employer_name", "job_employment_type",
     "job_application_link", "job_description", "job_is_remote",
     "job_location", "job_city", "job_state", "job_country",
     "job_benefits", "job_salary", "job_min_salary", "job_max_salary",
-    "job_highlights", "job_responsibilities", "date_posted", "job_hash"
+    "job_highlights", "job_responsibilities", "date_posted", "job_hash",
+    "job_salary_currency", "job_annual_min_salary", "job_annual_max_salary"
 ]
 
-def validate_columns(df: pd.DataFrame) -> bool:
+# Columns added after the first processed files were written; filled with NULL when absent
+NULLABLE_COLUMNS = ["job_salary_currency", "job_annual_min_salary", "job_annual_max_salary"]
+
+def validate_columns(df: "pd.DataFrame") -> bool:
     """Validate DataFrame contains all required columns"""
+    for col in NULLABLE_COLUMNS:
+        if col not in df.columns:
+            df[col] = None
     missing = set(REQUIRED_COLUMNS) - set(df.columns)
     if missing:
         logger.error(f"Missing required columns: {', '.join(missing)}")
         return False
     return True
 
+@profiler.hot
 def process_csv_data(csv_data: bytes, chunk_size: int = 1000) -> List[Tuple]:
     """Process CSV data into database-ready tuples"""
+    import pandas as pd
+
     processed_data = []
     
     try:
@@ -50,4 +65,40 @@ def process_csv_data(csv_data: bytes, chunk_size: int = 1000) -> List[Tuple]:
     except Exception as e:
         logger.error(f"Data processing error: {str(e)}")
     
-    return processed_data
\ No newline at end of file
+    return processed_data
+
+@profiler.hot
+def process_parquet_data(parquet_data: bytes, batch_size: int = 1000) -> List[Tuple]:
+    """Process a typed Parquet file into database-ready tuples, one record batch at a time"""
+    from src.jobs.processors.parquet_format import iter_processed_batches
+
+    processed_data = []
+    loaded_at = datetime.now(timezone.utc)
+    try:
+        for columns in iter_processed_batches(parquet_data, REQUIRED_COLUMNS, batch_size):
+            processed_data.extend(zip(*columns, repeat(loaded_at)))
+    except Exception as e:
+        logger.error(f"Data processing error: {str(e)}")
+
+    return processed_data
+
+def process_processed_file(key: str, data: bytes) -> List[Tuple]:
+    """Dispatch a processed_data/ file to the reader for its format"""
+    if key.endswith(".parquet"):
+        return process_parquet_data(data)
+    return process_csv_data(data)
+
+def jobs_to_rows(jobs: List[ProcessedJob]) -> List[Tuple]:
+    """Convert processed jobs straight into database-ready tuples, skipping the CSV round trip"""
+    rows = []
+    loaded_at = datetime.now(timezone.utc)
+    date_index = REQUIRED_COLUMNS.index("date_posted")
+    for job in jobs:
+        values = vars(job)
+        row = [values.get(col) for col in REQUIRED_COLUMNS]
+        posted = row[date_index]
+        # Match process_csv_data(): naive UTC timestamps
+        if isinstance(posted, datetime) and posted.tzinfo is not None:
+            row[date_index] = posted.astimezone(timezone.utc).replace(tzinfo=None)
+        rows.append(tuple(row) + (loaded_at,))
+    return rows
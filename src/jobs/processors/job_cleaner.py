@@ -2,7 +2,10 @@ from datetime import datetime
 from dateutil.parser import parse
 from typing import Dict, Any
 from src.utils.data_utils import validate_url, clean_salary
+from src.jobs.processors.salary_normalizer import normalize_salary
+from src.utils.profiling import profiler
 
+@profiler.hot
 def clean_job_data(raw_job: Dict[str, Any]) -> Dict[str, Any]:
     """Clean and validate raw job data"""
     cleaned = raw_job.copy()
@@ -30,5 +33,13 @@ def clean_job_data(raw_job: Dict[str, Any]) -> Dict[str, Any]:
         'job_min_salary': clean_salary(str(raw_job.get('job_min_salary', ''))),
         'job_max_salary': clean_salary(str(raw_job.get('job_max_salary', ''))),
     })
+
+    # Annualized salary in the listing's currency
+    salary = normalize_salary(raw_job)
+    cleaned.update({
+        'job_salary_currency': salary.currency,
+        'job_annual_min_salary': salary.annual_min,
+        'job_annual_max_salary': salary.annual_max,
+    })
     
     return cleaned
\ No newline at end of file
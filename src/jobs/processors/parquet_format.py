@@ -0,0 +1,94 @@
+from dataclasses import fields
+from datetime import datetime, timezone
+from io import BytesIO
+from typing import Iterator, List, Optional, Union, get_args, get_origin, get_type_hints
+from src.models.job_models import ProcessedJob
+from src.utils.config import PARQUET_COMPRESSION, PARQUET_ROW_GROUP_SIZE
+
+def _pyarrow():
+    """Import pyarrow on first use so CSV-only deployments do not need it"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet processed files require pyarrow (pip install pyarrow)") from e
+    return pa, pq
+
+def _arrow_type(pa, annotation):
+    """Map a ProcessedJob annotation to an Arrow type"""
+    if get_origin(annotation) is Union:
+        annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+    if annotation is bool:
+        return pa.bool_()
+    if annotation is float:
+        return pa.float64()
+    if annotation is datetime:
+        return pa.timestamp("us", tz="UTC")
+    return pa.string()
+
+def processed_job_schema():
+    """Arrow schema for processed files, derived from the ProcessedJob dataclass"""
+    pa, _ = _pyarrow()
+    hints = get_type_hints(ProcessedJob)
+    return pa.schema([
+        pa.field(field.name, _arrow_type(pa, hints[field.name]), nullable=True)
+        for field in fields(ProcessedJob)
+    ])
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Treat naive timestamps as UTC, as the CSV reader does"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def write_processed_parquet(jobs: List[ProcessedJob], row_group_size: int = PARQUET_ROW_GROUP_SIZE) -> bytes:
+    """Serialize processed jobs to a compressed Parquet file"""
+    pa, pq = _pyarrow()
+    schema = processed_job_schema()
+    columns = {name: [] for name in schema.names}
+    for job in jobs:
+        values = vars(job)
+        for name, column in columns.items():
+            column.append(values.get(name))
+
+    for field in schema:
+        if pa.types.is_timestamp(field.type):
+            columns[field.name] = [_as_utc(value) for value in columns[field.name]]
+        elif pa.types.is_floating(field.type):
+            columns[field.name] = [None if value is None else float(value) for value in columns[field.name]]
+        elif pa.types.is_string(field.type):
+            # Anything the API hands back that is not text is stored as CSV would have written it
+            columns[field.name] = [
+                value if value is None or isinstance(value, str) else str(value)
+                for value in columns[field.name]
+            ]
+
+    table = pa.Table.from_pydict(columns, schema=schema)
+    buffer = BytesIO()
+    pq.write_table(table, buffer, compression=PARQUET_COMPRESSION, row_group_size=row_group_size)
+    return buffer.getvalue()
+
+def iter_processed_batches(data: bytes, columns: List[str], batch_size: int = PARQUET_ROW_GROUP_SIZE) -> Iterator[List[list]]:
+    """
+    Read a processed Parquet file one record batch at a time, as one value list per column.
+
+    Values come back already typed; timestamps are returned as naive UTC to
+    match the CSV reader. Requested columns missing from older files are
+    returned as NULL. Each column is converted to Python objects once, since
+    the database driver needs them; callers zip the columns into rows.
+    """
+    pa, pq = _pyarrow()
+    parquet_file = pq.ParquetFile(pa.BufferReader(data))
+    available = set(parquet_file.schema_arrow.names)
+    present = [col for col in columns if col in available]
+
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=present):
+        by_name = {}
+        for name, array in zip(batch.schema.names, batch.columns):
+            if pa.types.is_timestamp(array.type) and array.type.tz is not None:
+                array = array.cast(pa.timestamp(array.type.unit))
+            by_name[name] = array.to_pylist()
+        empty = [None] * batch.num_rows
+        yield [by_name.get(col, empty) for col in columns]
@@ -0,0 +1,136 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+from src.utils.data_utils import clean_salary
+
+# Multipliers that turn a pay rate into a yearly figure
+ANNUAL_MULTIPLIERS = {
+    "HOUR": 2080,   # 40 hours x 52 weeks
+    "DAY": 260,
+    "WEEK": 52,
+    "MONTH": 12,
+    "YEAR": 1,
+}
+
+PERIOD_PATTERNS = [
+    ("HOUR", r"/\s*h(ou)?r|per\s+hour|hourly|an\s+hour|/h\b"),
+    ("DAY", r"/\s*day|per\s+day|daily"),
+    ("WEEK", r"/\s*w(ee)?k|per\s+week|weekly"),
+    ("MONTH", r"/\s*mo(nth)?|per\s+month|monthly|p\.?m\.?\b"),
+    ("YEAR", r"/\s*y(ea)?r|per\s+(year|annum)|annual(ly)?|yearly|p\.?a\.?\b"),
+]
+
+CURRENCY_SYMBOLS = {
+    "US$": "USD", "CA$": "CAD", "C$": "CAD", "A$": "AUD", "AU$": "AUD",
+    "€": "EUR", "£": "GBP", "¥": "JPY", "₹": "INR", "$": "USD",
+}
+CURRENCY_CODES = {"USD", "EUR", "GBP", "CAD", "AUD", "INR", "JPY", "CHF", "SEK", "NOK", "DKK", "PLN", "MXN", "BRL"}
+
+# Assumed currency when a listing gives none
+COUNTRY_CURRENCIES = {
+    "US": "USD", "CA": "CAD", "GB": "GBP", "UK": "GBP", "AU": "AUD", "IN": "INR",
+    "DE": "EUR", "FR": "EUR", "ES": "EUR", "IT": "EUR", "NL": "EUR", "IE": "EUR",
+    "AT": "EUR", "BE": "EUR", "PT": "EUR", "FI": "EUR",
+}
+
+# Without an explicit period, amounts below (hourly, monthly) ceilings are read as
+# hourly/monthly pay. Only currencies listed here get a guessed period; for the
+# rest (e.g. INR, JPY) the ranges overlap too much and annual figures stay NULL.
+PERIOD_CEILINGS = {
+    "USD": (500, 20000),
+    "CAD": (500, 20000),
+    "AUD": (500, 20000),
+    "EUR": (500, 15000),
+    "GBP": (500, 15000),
+    "CHF": (500, 25000),
+}
+
+@dataclass
+class NormalizedSalary:
+    currency: Optional[str]
+    period: Optional[str]
+    annual_min: Optional[float]
+    annual_max: Optional[float]
+
+def detect_currency(text: str, country: Optional[str] = None) -> Optional[str]:
+    """Detect an ISO currency code from symbols or codes in text, else by country"""
+    upper = (text or "").upper()
+    for code in re.findall(r"\b[A-Z]{3}\b", upper):
+        if code in CURRENCY_CODES:
+            return code
+    # Longest symbols first so "CA$" wins over "$"
+    for symbol in sorted(CURRENCY_SYMBOLS, key=len, reverse=True):
+        if symbol.upper() in upper:
+            return CURRENCY_SYMBOLS[symbol]
+    return COUNTRY_CURRENCIES.get((country or "").upper())
+
+def detect_period(text: str, explicit: Optional[str] = None) -> Optional[str]:
+    """Detect the pay period from an explicit field or from the salary text"""
+    if explicit and explicit.upper() in ANNUAL_MULTIPLIERS:
+        return explicit.upper()
+    lowered = (text or "").lower()
+    for period, pattern in PERIOD_PATTERNS:
+        if re.search(pattern, lowered):
+            return period
+    return None
+
+def _infer_period(amount: float, currency: Optional[str]) -> Optional[str]:
+    """Guess the pay period from the size of an amount in a known currency"""
+    ceilings = PERIOD_CEILINGS.get(currency)
+    if ceilings is None:
+        return None
+    hourly_ceiling, monthly_ceiling = ceilings
+    if amount < hourly_ceiling:
+        return "HOUR"
+    if amount < monthly_ceiling:
+        return "MONTH"
+    return "YEAR"
+
+def _split_range(text: str):
+    """Split "55.000 - 60.000" style text into its two bounds"""
+    parts = re.split(r"\s*(?:-|–|—|\bto\b)\s*(?=[^\d]*\d)", text, maxsplit=1)
+    return (parts[0], parts[1]) if len(parts) == 2 else (text, None)
+
+def normalize_salary(raw_job: Dict[str, Any]) -> NormalizedSalary:
+    """
+    Normalize a raw JSearch listing's salary to annual min/max figures.
+
+    Uses job_min_salary/job_max_salary when present and falls back to the
+    free-text job_salary, honouring locale separators, currency markers and
+    hourly/daily/weekly/monthly/yearly periods. Without a stated period one
+    is only guessed for currencies in PERIOD_CEILINGS; otherwise the annual
+    figures are left as None.
+    """
+    raw_text = str(raw_job.get("job_salary") or "")
+    context = " ".join(
+        str(raw_job.get(field) or "")
+        for field in ("job_salary", "job_salary_currency", "job_salary_period")
+    )
+
+    low = clean_salary(str(raw_job.get("job_min_salary") or ""))
+    high = clean_salary(str(raw_job.get("job_max_salary") or ""))
+    if low is None and high is None and raw_text:
+        low_text, high_text = _split_range(raw_text)
+        low = clean_salary(low_text)
+        high = clean_salary(high_text) if high_text else None
+
+    if low is None and high is None:
+        return NormalizedSalary(None, None, None, None)
+
+    low = low if low is not None else high
+    high = high if high is not None else low
+    if low > high:
+        low, high = high, low
+
+    currency = detect_currency(context, raw_job.get("job_country"))
+    period = detect_period(context, raw_job.get("job_salary_period")) or _infer_period(high, currency)
+    if period is None:
+        return NormalizedSalary(currency, None, None, None)
+
+    multiplier = ANNUAL_MULTIPLIERS[period]
+    return NormalizedSalary(
+        currency=currency,
+        period=period,
+        annual_min=round(low * multiplier, 2),
+        annual_max=round(high * multiplier, 2),
+    )
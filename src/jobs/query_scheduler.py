@@ -0,0 +1,243 @@
+# src/jobs/query_scheduler.py
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import psycopg2
+from psycopg2.extras import execute_values
+from src.clients.postgres_client import PostgresClient
+from src.utils.config import (
+    FETCH_QUERIES_FILE, FETCH_CALL_BUDGET,
+    FETCH_MIN_INTERVAL_HOURS, FETCH_MAX_INTERVAL_HOURS
+)
+from src.utils.data_utils import generate_job_hash
+from src.utils.logger import logger
+
+LISTINGS_PER_PAGE = 10      # JSearch returns up to 10 listings per page
+TARGET_NEW_PER_CALL = 5     # Refresh a query once about half a page is expected to be new
+RATE_SMOOTHING = 0.3        # Weight of the newest observation in the yield-rate EWMA
+UNSEEN_QUERY_PRIORITY = float(LISTINGS_PER_PAGE)  # Fetch never-seen queries first
+DUE_TOLERANCE = timedelta(minutes=5)  # Scheduler start-up jitter that still counts as on time
+
+SCHEDULER_SCHEMA_DDL = """
+    CREATE TABLE IF NOT EXISTS fetch_query_stats (
+        query_key TEXT PRIMARY KEY,
+        params JSONB NOT NULL,
+        calls INTEGER NOT NULL DEFAULT 0,
+        listings_seen INTEGER NOT NULL DEFAULT 0,
+        new_listings INTEGER NOT NULL DEFAULT 0,
+        rate_per_hour DOUBLE PRECISION NOT NULL DEFAULT 0,
+        interval_hours DOUBLE PRECISION NOT NULL,
+        last_fetched_at TIMESTAMPTZ,
+        next_due_at TIMESTAMPTZ
+    )
+"""
+
+@dataclass
+class QueryState:
+    params: Dict[str, Any]
+    query_key: str
+    calls: int = 0
+    listings_seen: int = 0
+    new_listings: int = 0
+    rate_per_hour: float = 0.0
+    interval_hours: float = FETCH_MIN_INTERVAL_HOURS
+    last_fetched_at: Optional[datetime] = None
+    next_due_at: Optional[datetime] = None
+
+    @property
+    def cost(self) -> int:
+        """API calls one fetch of this query spends"""
+        return max(1, int(self.params.get("num_pages", 1)))
+
+    def expected_new_per_call(self, now: datetime) -> float:
+        """Estimated new listings per API call if fetched now"""
+        if self.last_fetched_at is None:
+            return UNSEEN_QUERY_PRIORITY
+        hours = (now - self.last_fetched_at).total_seconds() / 3600
+        expected = min(self.rate_per_hour * hours, LISTINGS_PER_PAGE * self.cost)
+        return expected / self.cost
+
+def query_key(params: Dict[str, Any]) -> str:
+    """Stable identifier for a query's parameters, ignoring paging"""
+    identity = {k: v for k, v in params.items() if k not in ("page", "num_pages")}
+    return hashlib.sha1(json.dumps(identity, sort_keys=True).encode("utf-8")).hexdigest()
+
+def load_targets(default_params: Dict[str, Any], path: Optional[str] = FETCH_QUERIES_FILE) -> List[Dict[str, Any]]:
+    """Read tracked queries from a JSON list of parameter overrides"""
+    if not path:
+        return [default_params.copy()]
+    with open(path, encoding="utf-8") as f:
+        overrides = json.load(f)
+    return [{**default_params, **override} for override in overrides]
+
+class QueryScheduler:
+    """
+    Chooses which fetch queries to run so new listings per API call is maximized.
+
+    Every query keeps an EWMA of new listings per hour. A query's priority is
+    the number of new listings expected if it were fetched now, per API call,
+    and its refresh interval is the time expected to accumulate
+    TARGET_NEW_PER_CALL new listings per call, clamped to the configured bounds.
+    Each run spends at most the call budget on the due queries with the
+    highest expected yield. Next due times count from the run's planned
+    start, and queries due within DUE_TOLERANCE are treated as due, so a
+    query on an hourly interval is fetched by every hourly run. Without Postgres every query is treated as due,
+    every listing counts as new and nothing is persisted, so fetching still
+    works.
+    """
+
+    def __init__(self, targets: List[Dict[str, Any]], budget: int = FETCH_CALL_BUDGET):
+        self.budget = budget
+        self.states = {
+            query_key(params): QueryState(params=params, query_key=query_key(params))
+            for params in targets
+        }
+        self._seen_hashes = set()
+        self.offline = False
+        self.planned_at: Optional[datetime] = None
+
+    def _go_offline(self, action: str, error: Exception) -> None:
+        """Carry on without Postgres after a failed stats query"""
+        logger.warning(f"Query statistics unavailable ({action}): {str(error)}; fetching without them")
+        self.offline = True
+
+    def load(self) -> None:
+        """Restore per-query statistics from Postgres"""
+        conn = None
+        try:
+            conn = PostgresClient.get_connection()
+            with conn, conn.cursor() as cursor:
+                cursor.execute(SCHEDULER_SCHEMA_DDL)
+                cursor.execute("""
+                    SELECT query_key, calls, listings_seen, new_listings, rate_per_hour,
+                           interval_hours, last_fetched_at, next_due_at
+                    FROM fetch_query_stats
+                    WHERE query_key = ANY(%s)
+                """, (list(self.states),))
+                for key, *values in cursor.fetchall():
+                    state = self.states[key]
+                    (state.calls, state.listings_seen, state.new_listings, state.rate_per_hour,
+                     state.interval_hours, state.last_fetched_at, state.next_due_at) = values
+        except psycopg2.Error as e:
+            self._go_offline("load", e)
+        finally:
+            if conn:
+                PostgresClient.release_connection(conn)
+
+    def plan(self, now: Optional[datetime] = None) -> List[QueryState]:
+        """Pick due queries by expected new listings per call within the budget"""
+        now = now or datetime.now(timezone.utc)
+        self.planned_at = now
+        due = [
+            state for state in self.states.values()
+            if state.next_due_at is None or state.next_due_at <= now + DUE_TOLERANCE
+        ]
+        due.sort(key=lambda state: state.expected_new_per_call(now), reverse=True)
+
+        selected, spent = [], 0
+        for state in due:
+            if spent + state.cost > self.budget:
+                continue
+            selected.append(state)
+            spent += state.cost
+        logger.info(
+            f"Scheduled {len(selected)}/{len(self.states)} queries "
+            f"({len(due)} due) using {spent}/{self.budget} calls"
+        )
+        return selected
+
+    def dedupe_listings(self, jobs: List[dict]) -> Tuple[List[dict], int]:
+        """
+        Drop listings already fetched earlier in this run and count how many are new.
+
+        Listings already in job_data are still returned so their updated
+        fields get loaded; they only count against the query's yield.
+        """
+        hashes = {generate_job_hash(job): job for job in jobs}
+        fresh = {h: job for h, job in hashes.items() if h not in self._seen_hashes}
+        self._seen_hashes.update(hashes)
+        if not fresh or self.offline:
+            return list(fresh.values()), len(fresh)
+
+        conn = None
+        try:
+            conn = PostgresClient.get_connection()
+            with conn, conn.cursor() as cursor:
+                cursor.execute("SELECT to_regclass('job_data')")
+                if cursor.fetchone()[0] is None:
+                    return list(fresh.values()), len(fresh)
+                cursor.execute("SELECT job_hash FROM job_data WHERE job_hash = ANY(%s)", (list(fresh),))
+                known = {row[0] for row in cursor.fetchall()}
+        except psycopg2.Error as e:
+            self._go_offline("dedupe", e)
+            known = set()
+        finally:
+            if conn:
+                PostgresClient.release_connection(conn)
+        return list(fresh.values()), sum(h not in known for h in fresh)
+
+    def record(self, state: QueryState, listings: int, new: int, now: Optional[datetime] = None) -> None:
+        """Update a query's yield statistics and next due time after a fetch"""
+        now = now or datetime.now(timezone.utc)
+        if state.last_fetched_at is not None:
+            hours = max((now - state.last_fetched_at).total_seconds() / 3600, 1 / 60)
+            observed = new / hours
+            state.rate_per_hour = RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * state.rate_per_hour
+        else:
+            # First observation: assume the backlog built up over the minimum interval
+            state.rate_per_hour = new / FETCH_MIN_INTERVAL_HOURS
+
+        if state.rate_per_hour > 0:
+            interval = TARGET_NEW_PER_CALL * state.cost / state.rate_per_hour
+        else:
+            interval = state.interval_hours * 2
+        state.interval_hours = min(max(interval, FETCH_MIN_INTERVAL_HOURS), FETCH_MAX_INTERVAL_HOURS)
+
+        state.calls += state.cost
+        state.listings_seen += listings
+        state.new_listings += new
+        state.last_fetched_at = now
+        # From the run's start, not the fetch time, so the next run on the same cadence finds it due
+        state.next_due_at = (self.planned_at or now) + timedelta(hours=state.interval_hours)
+
+    def save(self) -> None:
+        """Persist statistics for every query fetched this run"""
+        rows = [
+            (s.query_key, json.dumps(s.params), s.calls, s.listings_seen, s.new_listings,
+             s.rate_per_hour, s.interval_hours, s.last_fetched_at, s.next_due_at)
+            for s in self.states.values() if s.last_fetched_at is not None
+        ]
+        if not rows:
+            return
+        if self.offline:
+            logger.warning("Postgres unavailable; query statistics from this run are not saved")
+            return
+        conn = None
+        try:
+            conn = PostgresClient.get_connection()
+            with conn, conn.cursor() as cursor:
+                cursor.execute(SCHEDULER_SCHEMA_DDL)
+                execute_values(cursor, """
+                    INSERT INTO fetch_query_stats (
+                        query_key, params, calls, listings_seen, new_listings,
+                        rate_per_hour, interval_hours, last_fetched_at, next_due_at
+                    )
+                    VALUES %s
+                    ON CONFLICT (query_key) DO UPDATE SET
+                        params = EXCLUDED.params,
+                        calls = EXCLUDED.calls,
+                        listings_seen = EXCLUDED.listings_seen,
+                        new_listings = EXCLUDED.new_listings,
+                        rate_per_hour = EXCLUDED.rate_per_hour,
+                        interval_hours = EXCLUDED.interval_hours,
+                        last_fetched_at = EXCLUDED.last_fetched_at,
+                        next_due_at = EXCLUDED.next_due_at
+                """, rows)
+        except psycopg2.Error as e:
+            logger.warning(f"Failed to save query statistics: {str(e)}")
+        finally:
+            if conn:
+                PostgresClient.release_connection(conn)
@@ -0,0 +1,107 @@
+# src/jobs/worker.py
+
+import asyncio
+import signal
+import time
+from typing import Optional
+
+from src.ai.openai_processor import close_openai_client
+from src.clients.postgres_client import PostgresClient, pipeline_lock
+from src.clients.s3_client import get_s3_client, close_s3_client
+from src.jobs.fetch_jobs import main_fetch, close_http_session
+from src.jobs.process_jobs import main_async
+from src.jobs.load_to_postgresql import load_data_to_postgres
+from src.jobs.pipeline_runner import StreamingPipeline
+from src.utils.config import PIPELINE_MODE, WORKER_INTERVAL_SECONDS
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.profiling import profiler
+
+class PipelineWorker:
+    """
+    Long-lived worker that runs the pipeline on a fixed schedule.
+
+    S3, HTTP, OpenAI and Postgres clients are created once and stay warm
+    across runs; everything runs on one event loop so the async OpenAI
+    client is reused too. Runs never overlap: ticks missed while a run is in
+    progress are skipped, and an advisory lock guards against other
+    processes. SIGTERM/SIGINT let the current run finish, then shut down.
+    """
+
+    def __init__(self, interval: int = WORKER_INTERVAL_SECONDS, mode: str = PIPELINE_MODE):
+        self.interval = interval
+        self.mode = mode
+        self.s3 = get_s3_client()
+        self._stop: Optional[asyncio.Event] = None
+
+    def request_stop(self) -> None:
+        """Ask the worker to exit after the current run"""
+        logger.info("Shutdown requested; finishing current run")
+        self._stop.set()
+
+    async def run_once(self) -> None:
+        """Run one pipeline pass unless another run holds the lock"""
+        with pipeline_lock() as acquired:
+            if not acquired:
+                logger.warning("Another pipeline run is in progress; skipping this tick")
+                return
+            if self.mode == "streaming":
+                await StreamingPipeline(self.s3).run()
+            else:
+                if await asyncio.to_thread(main_fetch) is None:
+                    return
+                await main_async(self.s3)
+                await asyncio.to_thread(load_data_to_postgres)
+
+    async def serve(self) -> None:
+        """Run on schedule until a stop signal arrives"""
+        self._stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.request_stop)
+
+        logger.info(f"Worker started; running every {self.interval}s in {self.mode} mode")
+        next_run = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                started = time.monotonic()
+                try:
+                    await self.run_once()
+                except Exception:
+                    logger.error("Scheduled pipeline run failed", exc_info=True)
+                elapsed = time.monotonic() - started
+                logger.info(f"Pipeline run took {elapsed:.1f}s")
+                # One summary per run; the textfile reflects the latest run
+                metrics.flush()
+                metrics.reset()
+                profiler.flush()
+                if self._stop.is_set():
+                    break
+
+                # Skip ticks that passed while the run was still going
+                next_run += self.interval
+                if next_run < time.monotonic():
+                    skipped = int((time.monotonic() - next_run) // self.interval) + 1
+                    logger.warning(f"Run overran the schedule; skipping {skipped} tick(s)")
+                    next_run += skipped * self.interval
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=next_run - time.monotonic())
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self.shutdown()
+
+    async def shutdown(self) -> None:
+        """Release pooled connections and clients"""
+        close_http_session()
+        await close_openai_client()
+        close_s3_client()
+        PostgresClient.close_all_connections()
+        logger.info("Worker stopped")
+
+def run_worker(interval: int = WORKER_INTERVAL_SECONDS, mode: str = PIPELINE_MODE) -> None:
+    """Entry point for daemon mode"""
+    asyncio.run(PipelineWorker(interval, mode).serve())
+
+if __name__ == "__main__":
+    run_worker()
@@ -22,4 +22,7 @@ class ProcessedJob:
     job_responsibilities: Optional[str]
     date_posted: Optional[datetime]
     job_hash: str
-    integrated_timestamp: datetime
\ No newline at end of file
+    integrated_timestamp: datetime
+    job_salary_currency: Optional[str] = None
+    job_annual_min_salary: Optional[float] = None
+    job_annual_max_salary: Optional[float] = None
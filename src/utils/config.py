@@ -1,19 +1,39 @@
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+def _load_env_file() -> None:
+    """Load the nearest .env above this package, importing python-dotenv only when one exists"""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        path = os.path.join(directory, ".env")
+        if os.path.isfile(path):
+            from dotenv import load_dotenv
+            load_dotenv(path)
+            return
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return
+        directory = parent
 
-import os
+_load_env_file()
 
 # RapidAPI configuration
 RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY", "your_default_rapidapi_key")
 RAPIDAPI_HOST = "jsearch.p.rapidapi.com"
 API_REQUEST_TIMEOUT = 15  # seconds
 
+# Fetch query scheduling
+FETCH_QUERIES_FILE = os.getenv("FETCH_QUERIES_FILE")  # JSON list of query parameter overrides
+FETCH_CALL_BUDGET = int(os.getenv("FETCH_CALL_BUDGET", "20"))  # RapidAPI calls per run
+FETCH_MIN_INTERVAL_HOURS = float(os.getenv("FETCH_MIN_INTERVAL_HOURS", "1"))
+FETCH_MAX_INTERVAL_HOURS = float(os.getenv("FETCH_MAX_INTERVAL_HOURS", "168"))
+
 # AWS S3 configuration
 S3_BUCKET = os.getenv("AWS_BUCKET_NAME")
 AWS_ACCESS_KEY = os.getenv("AWS_ACCESS_KEY")
 AWS_SECRET_KEY = os.getenv("AWS_SECRET_KEY")
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "32"))
+S3_MAX_RETRY_ATTEMPTS = int(os.getenv("S3_MAX_RETRY_ATTEMPTS", "5"))
+S3_ARCHIVE_WORKERS = int(os.getenv("S3_ARCHIVE_WORKERS", "16"))
 
 # PostgreSQL configuration
 DB_HOST = os.getenv("DB_HOST")
@@ -21,11 +41,57 @@ DB_NAME = os.getenv("DB_NAME")
 DB_USER = os.getenv("DB_USER")
 DB_PASS = os.getenv("DB_PASS")
 DB_PORT = os.getenv("DB_PORT")
+DB_SSLMODE = os.getenv("DB_SSLMODE", "require")
 
 # OpenAI configuration
 OPENAI_KEY = os.getenv("OPENAI_KEY")
 OPENAI_MODEL = "gpt-3.5-turbo"
 
+# Streaming pipeline runner
+PIPELINE_MODE = os.getenv("PIPELINE_MODE", "sequential")  # "streaming" or "sequential"
+PIPELINE_CHANNEL_SIZE = int(os.getenv("PIPELINE_CHANNEL_SIZE", "4"))  # Batches buffered between stages
+PIPELINE_BATCH_SIZE = int(os.getenv("PIPELINE_BATCH_SIZE", "50"))  # Jobs per in-flight batch
+
+# Interchange format for processed_data/ files
+PROCESSED_FORMAT = os.getenv("PROCESSED_FORMAT", "parquet")  # "parquet" or "csv"
+PARQUET_COMPRESSION = os.getenv("PARQUET_COMPRESSION", "zstd")
+PARQUET_ROW_GROUP_SIZE = int(os.getenv("PARQUET_ROW_GROUP_SIZE", "1000"))  # Rows per row group / read batch
+
+# Long-lived worker mode
+WORKER_INTERVAL_SECONDS = int(os.getenv("WORKER_INTERVAL_SECONDS", "3600"))
+WORKER_LOCK_ID = int(os.getenv("WORKER_LOCK_ID", "815405"))  # Postgres advisory lock key
+
+# job_data partitioning
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+PARTITION_RETENTION_MONTHS = int(os.getenv("PARTITION_RETENTION_MONTHS", "0"))  # 0 keeps everything
+PARTITION_DETACH_LOCK_TIMEOUT = os.getenv("PARTITION_DETACH_LOCK_TIMEOUT", "5s")  # give up rather than queue readers
+
+# Similar-jobs recommendations
+SIMILAR_JOBS_TOP_K = int(os.getenv("SIMILAR_JOBS_TOP_K", "10"))
+SIMILARITY_FEATURES = 2 ** 18  # Hashed feature space
+SIMILARITY_MIN_SCORE = float(os.getenv("SIMILARITY_MIN_SCORE", "0.1"))
+
+# Dashboard configuration
+DASHBOARD_PAGE_SIZE = int(os.getenv("DASHBOARD_PAGE_SIZE", "25"))
+DASHBOARD_DEFAULT_POSTED_WITHIN_DAYS = int(os.getenv("DASHBOARD_DEFAULT_POSTED_WITHIN_DAYS", "90"))
+DASHBOARD_POOL_MIN_CONN = int(os.getenv("DASHBOARD_POOL_MIN_CONN", "1"))
+DASHBOARD_POOL_MAX_CONN = int(os.getenv("DASHBOARD_POOL_MAX_CONN", "10"))
+DASHBOARD_POOL_WAIT_SECONDS = float(os.getenv("DASHBOARD_POOL_WAIT_SECONDS", "10"))  # Wait for a free connection
+DASHBOARD_CACHE_MAX_ENTRIES = int(os.getenv("DASHBOARD_CACHE_MAX_ENTRIES", "256"))
+DASHBOARD_VERSION_CHECK_SECONDS = float(os.getenv("DASHBOARD_VERSION_CHECK_SECONDS", "5"))
+DASHBOARD_METRICS_FLUSH_SECONDS = float(os.getenv("DASHBOARD_METRICS_FLUSH_SECONDS", "60"))  # dashboard.prom refresh
+DASHBOARD_EXPORT_URL_SECONDS = int(os.getenv("DASHBOARD_EXPORT_URL_SECONDS", "3600"))  # Presigned export link lifetime
+
+# Instrumentation output (Prometheus textfile and JSON run summaries)
+METRICS_DIR = os.getenv("METRICS_DIR", "logs/metrics")
+
+# Opt-in profiling (CPU, memory and event-loop reports per run)
+PROFILE_ENABLED = os.getenv("PIPELINE_PROFILE", "").lower() in ("1", "true", "yes")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "logs/profiles")
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "25"))  # Functions and allocation sites per report
+PROFILE_TRACEMALLOC_FRAMES = int(os.getenv("PROFILE_TRACEMALLOC_FRAMES", "1"))
+PROFILE_LOOP_INTERVAL = float(os.getenv("PROFILE_LOOP_INTERVAL", "0.05"))  # Seconds between loop-lag samples
+
 POOL_MIN_CONN = 1
 POOL_MAX_CONN = 10
 CONNECTION_TIMEOUT = 30
\ No newline at end of file
@@ -8,8 +8,35 @@ def clean_salary(salary_str: str) -> Optional[float]:
     if not salary_str:
         return None
     try:
-        cleaned = re.sub(r"[^\d.]", "", salary_str.replace(",", ""))
-        return float(cleaned) if cleaned else None
+        text = salary_str.strip().lower()
+        multiplier = 1
+        if re.search(r"\d\s*k\b", text):
+            multiplier = 1000
+        elif re.search(r"\d\s*m\b", text):
+            multiplier = 1_000_000
+
+        # First number only: "45-50/hr" and "55.000 - 60.000" yield their lower bound
+        match = re.search(r"\d[\d.,\s\u00a0']*", text)
+        if not match:
+            return None
+        number = re.sub(r"[\s\u00a0']", "", match.group()).rstrip(".,")
+
+        if "." in number and "," in number:
+            # Whichever separator comes last is the decimal mark
+            decimal = "." if number.rfind(".") > number.rfind(",") else ","
+            thousands = "," if decimal == "." else "."
+            number = number.replace(thousands, "").replace(decimal, ".")
+        else:
+            for sep in (".", ","):
+                if sep not in number:
+                    continue
+                groups = number.split(sep)
+                # Repeated separators or a trailing 3-digit group mark thousands
+                if len(groups) > 2 or len(groups[-1]) == 3:
+                    number = number.replace(sep, "")
+                else:
+                    number = number.replace(sep, ".")
+        return float(number) * multiplier if number else None
     except (ValueError, TypeError):
         return None
 
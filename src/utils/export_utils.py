@@ -0,0 +1,62 @@
+import csv
+import io
+from decimal import Decimal
+from typing import BinaryIO, Iterable, List, Sequence
+
+EXPORT_FORMATS = ("csv", "parquet")
+
+def write_csv(batches: Iterable[Sequence[tuple]], columns: List[str], fileobj: BinaryIO) -> int:
+    """Write row batches as UTF-8 CSV, returning the number of rows written"""
+    text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="", write_through=True)
+    writer = csv.writer(text)
+    writer.writerow(columns)
+    total = 0
+    for batch in batches:
+        writer.writerows(batch)
+        total += len(batch)
+    text.flush()
+    # Leave the caller's file open
+    text.detach()
+    return total
+
+def write_parquet(batches: Iterable[Sequence[tuple]], columns: List[str], fileobj: BinaryIO) -> int:
+    """Write row batches as Parquet row groups, returning the number of rows written"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)") from e
+
+    writer = None
+    total = 0
+    try:
+        for batch in batches:
+            if not batch:
+                continue
+            # NUMERIC columns arrive as Decimal with per-value precision; store as doubles
+            table = pa.Table.from_pylist([
+                {col: float(value) if isinstance(value, Decimal) else value for col, value in zip(columns, row)}
+                for row in batch
+            ])
+            if writer is None:
+                # Columns that are all NULL in the first batch would otherwise be typed null
+                schema = pa.schema([
+                    pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+                    for field in table.schema
+                ])
+                writer = pq.ParquetWriter(fileobj, schema, compression="zstd")
+            table = table.cast(writer.schema, safe=False)
+            writer.write_table(table)
+            total += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    return total
+
+def write_export(fmt: str, batches: Iterable[Sequence[tuple]], columns: List[str], fileobj: BinaryIO) -> int:
+    """Write row batches in the requested export format"""
+    if fmt == "csv":
+        return write_csv(batches, columns, fileobj)
+    if fmt == "parquet":
+        return write_parquet(batches, columns, fileobj)
+    raise ValueError(f"Unsupported export format: {fmt}")
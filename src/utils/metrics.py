@@ -0,0 +1,209 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from src.utils.config import METRICS_DIR
+from src.utils.logger import logger
+
+METRIC_PREFIX = "etl_"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+class StageTimer:
+    """Handle returned by MetricsRegistry.stage() for reporting record counts"""
+
+    def __init__(self):
+        self.records = 0
+
+class MetricsRegistry:
+    """
+    Process-wide counters, gauges and histograms for the pipeline.
+
+    Metrics are keyed by name plus labels and can be written as a Prometheus
+    textfile (for node_exporter's textfile collector) and as a JSON run summary.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._started_at = datetime.now(timezone.utc)
+        self._flushed_at = 0.0
+
+    @staticmethod
+    def _key(labels: Dict[str, object]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """Add to a counter"""
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            key = self._key(labels)
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        """Set a gauge"""
+        with self._lock:
+            self._gauges.setdefault(name, {})[self._key(labels)] = value
+
+    def observe(self, name: str, value: float, buckets=DEFAULT_BUCKETS, **labels) -> None:
+        """Record a histogram observation"""
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            key = self._key(labels)
+            if key not in series:
+                series[key] = _Histogram(buckets)
+            series[key].observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe the duration of a block in seconds"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    @contextmanager
+    def stage(self, stage: str):
+        """Time a pipeline stage and count the records it handled"""
+        handle = StageTimer()
+        started = time.perf_counter()
+        try:
+            yield handle
+        finally:
+            elapsed = time.perf_counter() - started
+            self.inc("stage_duration_seconds_total", elapsed, stage=stage)
+            self.inc("stage_records_total", handle.records, stage=stage)
+            self.inc("stage_runs_total", stage=stage)
+
+    def reset(self) -> None:
+        """Drop all series, starting a new run"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+            self._started_at = datetime.now(timezone.utc)
+
+    @staticmethod
+    def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(key) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        escaped = (v.replace("\\", "\\\\").replace('"', '\\"') for _, v in pairs)
+        return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+    def to_prometheus(self) -> str:
+        """Render all series in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for kind, families in (("counter", self._counters), ("gauge", self._gauges)):
+                for name, series in sorted(families.items()):
+                    full = METRIC_PREFIX + name
+                    lines.append(f"# TYPE {full} {kind}")
+                    for key, value in sorted(series.items()):
+                        lines.append(f"{full}{self._format_labels(key)} {value}")
+            for name, series in sorted(self._histograms.items()):
+                full = METRIC_PREFIX + name
+                lines.append(f"# TYPE {full} histogram")
+                for key, hist in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(list(hist.buckets) + ["+Inf"], hist.counts):
+                        cumulative += count
+                        lines.append(f"{full}_bucket{self._format_labels(key, ('le', str(bound)))} {cumulative}")
+                    lines.append(f"{full}_sum{self._format_labels(key)} {hist.total}")
+                    lines.append(f"{full}_count{self._format_labels(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> dict:
+        """Summarize the run: stage throughput, latency stats, counters and gauges"""
+        def label_str(key: LabelKey) -> str:
+            return ",".join(f"{k}={v}" for k, v in key) or "all"
+
+        with self._lock:
+            stages = {}
+            for key, seconds in self._counters.get("stage_duration_seconds_total", {}).items():
+                stage = dict(key)["stage"]
+                records = self._counters.get("stage_records_total", {}).get(key, 0)
+                stages[stage] = {
+                    "seconds": round(seconds, 3),
+                    "records": records,
+                    "records_per_second": round(records / seconds, 2) if seconds else None,
+                }
+            histograms = {
+                name: {
+                    label_str(key): {
+                        "count": hist.count,
+                        "mean": round(hist.total / hist.count, 4) if hist.count else None,
+                        "sum": round(hist.total, 4),
+                    }
+                    for key, hist in series.items()
+                }
+                for name, series in self._histograms.items()
+            }
+            counters = {
+                name: {label_str(key): value for key, value in series.items()}
+                for name, series in self._counters.items()
+                if not name.startswith("stage_")
+            }
+            gauges = {
+                name: {label_str(key): value for key, value in series.items()}
+                for name, series in self._gauges.items()
+            }
+        return {
+            "started_at": self._started_at.isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "stages": stages,
+            "latency": histograms,
+            "counters": counters,
+            "gauges": gauges,
+        }
+
+    def flush(self, directory: str = METRICS_DIR, name: str = "etl_pipeline", summary: bool = True) -> Tuple[str, Optional[str]]:
+        """Write the Prometheus textfile and, unless disabled, a timestamped JSON run summary"""
+        os.makedirs(directory, exist_ok=True)
+        prom_path = os.path.join(directory, f"{name}.prom")
+        tmp_path = prom_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        # Atomic replace so the textfile collector never reads a partial file
+        os.replace(tmp_path, prom_path)
+        if not summary:
+            return prom_path, None
+
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        summary_path = os.path.join(directory, f"run_{stamp}.json")
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2, default=str)
+        logger.info(f"Wrote metrics to {prom_path} and {summary_path}")
+        return prom_path, summary_path
+
+    def maybe_flush(self, interval: float, **kwargs) -> bool:
+        """Flush at most once per interval, for long-lived processes without run boundaries"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._flushed_at < interval:
+                return False
+            self._flushed_at = now
+        self.flush(**kwargs)
+        return True
+
+metrics = MetricsRegistry()
@@ -0,0 +1,319 @@
+import asyncio
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from src.utils.config import (
+    PROFILE_ENABLED, PROFILE_DIR, PROFILE_TOP_N,
+    PROFILE_TRACEMALLOC_FRAMES, PROFILE_LOOP_INTERVAL
+)
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+
+# Allocation sites that belong to the profiler or the import system, not the pipeline
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+class _LoopSampler:
+    """Samples event-loop lag and live task counts while a stage runs"""
+
+    def __init__(self, interval: float = PROFILE_LOOP_INTERVAL):
+        self.interval = interval
+        self.lags: List[float] = []
+        self.tasks: List[int] = []
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            # Anything beyond the requested sleep is time the loop spent blocked
+            self.lags.append(max(0.0, loop.time() - expected))
+            self.tasks.append(len(asyncio.all_tasks()))
+
+    def summary(self) -> dict:
+        if not self.lags:
+            return {"samples": 0}
+        lags = sorted(self.lags)
+        return {
+            "samples": len(lags),
+            "lag_mean_seconds": round(sum(lags) / len(lags), 5),
+            "lag_p95_seconds": round(lags[min(len(lags) - 1, int(len(lags) * 0.95))], 5),
+            "lag_max_seconds": round(lags[-1], 5),
+            "tasks_max": max(self.tasks),
+            "tasks_mean": round(sum(self.tasks) / len(self.tasks), 1),
+        }
+
+class StageProfile:
+    """Profiling state for one stage run"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.cpu: Optional[cProfile.Profile] = None
+        self.loop_sampler: Optional[_LoopSampler] = None
+        self.started_tracing = False
+        self.started_at = datetime.now(timezone.utc)
+        self.wall_started = time.perf_counter()
+        self.cpu_started = time.process_time()
+
+class Profiler:
+    """
+    Opt-in CPU, memory and event-loop profiling for pipeline stages.
+
+    Off unless PIPELINE_PROFILE is set or enable() is called (main.py
+    --profile); when off, decorated functions only pay an attribute check.
+    Stages collect a cProfile profile, the tracemalloc peak and top
+    allocation sites, and for async stages event-loop lag and task counts.
+    Hot functions record call counts, time and net allocations. flush()
+    writes one report per run next to the metrics under logs/.
+    """
+
+    def __init__(self, enabled: bool = PROFILE_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._active: Optional[StageProfile] = None
+        self._stages: List[dict] = []
+        self._cpu_profiles: List[cProfile.Profile] = []
+        self._hot: Dict[str, dict] = {}
+
+    def enable(self) -> None:
+        """Turn profiling on for the rest of the process"""
+        self.enabled = True
+
+    @contextmanager
+    def profile(self, name: str):
+        """Profile a block as a stage; stages nested inside another are folded into it"""
+        if not self.enabled:
+            yield None
+            return
+        with self._lock:
+            outer = self._active
+            if outer is None:
+                stage = self._active = StageProfile(name)
+        if outer is not None:
+            yield outer
+            return
+
+        try:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+                stage.started_tracing = True
+            tracemalloc.reset_peak()
+            stage.cpu = cProfile.Profile()
+            try:
+                stage.cpu.enable()
+            except ValueError:
+                # Another profiler (e.g. an external cProfile run) already owns the hook
+                logger.warning(f"CPU profiling unavailable for {name}; another profiler is active")
+                stage.cpu = None
+            yield stage
+        finally:
+            if stage.cpu is not None:
+                stage.cpu.disable()
+            self._finish(stage)
+
+    def _finish(self, stage: StageProfile) -> None:
+        """Collect the stage's results and clear the active stage"""
+        wall = time.perf_counter() - stage.wall_started
+        cpu = time.process_time() - stage.cpu_started
+        peak = tracemalloc.get_traced_memory()[1]
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        if stage.started_tracing:
+            tracemalloc.stop()
+
+        report = {
+            "stage": stage.name,
+            "started_at": stage.started_at.isoformat(),
+            "wall_seconds": round(wall, 4),
+            "cpu_seconds": round(cpu, 4),
+            "peak_memory_bytes": peak,
+            "top_allocations": [
+                {
+                    "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "size_bytes": stat.size,
+                    "count": stat.count,
+                }
+                for stat in snapshot.statistics("lineno")[:PROFILE_TOP_N]
+            ],
+        }
+        if stage.cpu is not None:
+            report.update(_top_functions(stage.cpu))
+        if stage.loop_sampler is not None:
+            report["asyncio"] = stage.loop_sampler.summary()
+            if report["asyncio"]["samples"]:
+                metrics.set("profile_loop_lag_max_seconds", report["asyncio"]["lag_max_seconds"], stage=stage.name)
+
+        metrics.set("profile_peak_memory_bytes", peak, stage=stage.name)
+        metrics.set("profile_cpu_seconds", round(cpu, 4), stage=stage.name)
+        with self._lock:
+            report["cpu_profile_index"] = len(self._cpu_profiles) if stage.cpu is not None else None
+            if stage.cpu is not None:
+                self._cpu_profiles.append(stage.cpu)
+            self._stages.append(report)
+            self._active = None
+
+    @asynccontextmanager
+    async def watch_loop(self, stage: Optional[StageProfile]):
+        """Sample the running event loop for the active stage"""
+        if stage is None or stage.loop_sampler is not None:
+            yield
+            return
+        stage.loop_sampler = _LoopSampler()
+        task = asyncio.create_task(stage.loop_sampler.run())
+        try:
+            yield
+        finally:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def profiled(self, name: str) -> Callable:
+        """Decorator profiling a sync or async function as a pipeline stage"""
+        def decorator(func: Callable) -> Callable:
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return await func(*args, **kwargs)
+                    with self.profile(name) as stage:
+                        async with self.watch_loop(stage):
+                            return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.profile(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def hot(self, func: Callable) -> Callable:
+        """Decorator recording calls, time and net allocations of a frequently called function"""
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return func(*args, **kwargs)
+            tracing = tracemalloc.is_tracing()
+            before = tracemalloc.get_traced_memory()[0] if tracing else 0
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                allocated = tracemalloc.get_traced_memory()[0] - before if tracing else 0
+                with self._lock:
+                    stats = self._hot.setdefault(
+                        name, {"calls": 0, "seconds": 0.0, "max_seconds": 0.0, "net_allocated_bytes": 0}
+                    )
+                    stats["calls"] += 1
+                    stats["seconds"] += elapsed
+                    stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+                    stats["net_allocated_bytes"] += allocated
+        return wrapper
+
+    def flush(self, directory: str = PROFILE_DIR) -> Optional[str]:
+        """Write this run's report and raw CPU profiles, then start a new run"""
+        with self._lock:
+            stages, cpu_profiles, hot = self._stages, self._cpu_profiles, self._hot
+            self._stages, self._cpu_profiles, self._hot = [], [], {}
+        if not stages and not hot:
+            return None
+
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        profiled_stages = []
+        for position, report in enumerate(stages):
+            index = report.pop("cpu_profile_index")
+            cpu = cpu_profiles[index] if index is not None else None
+            if cpu is not None:
+                # Raw profiles open in snakeviz or pstats for drill-down
+                prof_path = os.path.join(directory, f"profile_{stamp}_{position}_{report['stage']}.prof")
+                cpu.dump_stats(prof_path)
+                report["cpu_profile"] = prof_path
+            profiled_stages.append((report, cpu))
+
+        run = {
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "stages": stages,
+            "hot_functions": {
+                name: {
+                    **stats,
+                    "seconds": round(stats["seconds"], 4),
+                    "max_seconds": round(stats["max_seconds"], 5),
+                    "mean_seconds": round(stats["seconds"] / stats["calls"], 6),
+                }
+                for name, stats in sorted(hot.items(), key=lambda item: -item[1]["seconds"])
+            },
+        }
+        report_path = os.path.join(directory, f"profile_{stamp}.json")
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2, default=str)
+        with open(os.path.join(directory, f"profile_{stamp}.txt"), "w", encoding="utf-8") as f:
+            f.write(_render_text(run, profiled_stages))
+        logger.info(f"Wrote profiling report to {report_path}")
+        return report_path
+
+def _top_functions(cpu: cProfile.Profile) -> dict:
+    """Heaviest functions by cumulative and by own time"""
+    stats = pstats.Stats(cpu).stats
+    rows = [
+        {
+            "function": f"{filename}:{line}({func})",
+            "calls": calls,
+            "self_seconds": round(self_time, 5),
+            "cumulative_seconds": round(cumulative, 5),
+        }
+        for (filename, line, func), (_, calls, self_time, cumulative, _) in stats.items()
+    ]
+    return {
+        "top_cumulative": sorted(rows, key=lambda row: -row["cumulative_seconds"])[:PROFILE_TOP_N],
+        "top_self": sorted(rows, key=lambda row: -row["self_seconds"])[:PROFILE_TOP_N],
+    }
+
+def _render_text(run: dict, profiled_stages: List[Tuple[dict, Optional[cProfile.Profile]]]) -> str:
+    """Human-readable companion to the JSON report"""
+    out = io.StringIO()
+    for report, cpu in profiled_stages:
+        out.write(f"=== {report['stage']} ({report['started_at']}) ===\n")
+        out.write(
+            f"wall {report['wall_seconds']}s  cpu {report['cpu_seconds']}s  "
+            f"peak memory {report['peak_memory_bytes'] / 1e6:.1f} MB\n"
+        )
+        if "asyncio" in report:
+            out.write(f"event loop: {report['asyncio']}\n")
+        out.write("\nTop allocations:\n")
+        for alloc in report["top_allocations"]:
+            out.write(f"  {alloc['size_bytes'] / 1e3:>10.1f} kB {alloc['count']:>8} blocks  {alloc['location']}\n")
+        if cpu is not None:
+            out.write("\n")
+            pstats.Stats(cpu, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+        out.write("\n")
+
+    if run["hot_functions"]:
+        out.write("=== hot functions ===\n")
+        for name, stats in run["hot_functions"].items():
+            out.write(
+                f"  {stats['calls']:>8} calls {stats['seconds']:>9.3f}s "
+                f"(max {stats['max_seconds']:.4f}s) {stats['net_allocated_bytes'] / 1e3:>10.1f} kB  {name}\n"
+            )
+    return out.getvalue()
+
+profiler = Profiler()
@@ -0,0 +1,83 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+from src.utils.metrics import metrics
+
+class VersionedQueryCache:
+    """
+    Bounded LRU cache for query results keyed on a data version.
+
+    Every entry is stored under the data version current when it was computed.
+    When the version changes (a load finished), older entries stop matching and
+    are evicted, so results stay warm between loads and are invalidated
+    right after one. The version itself is re-read at most once per
+    ``version_check_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        version_fn: Callable[[], Any],
+        max_entries: int = 256,
+        version_check_interval: float = 5.0
+    ):
+        self._version_fn = version_fn
+        self._max_entries = max_entries
+        self._version_check_interval = version_check_interval
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(name: str, *args, **kwargs) -> str:
+        """Build a stable key from a query name and JSON-serializable arguments"""
+        return json.dumps([name, args, kwargs], sort_keys=True, default=str)
+
+    def current_version(self) -> Any:
+        """Return the data version, refreshing it when the check interval elapsed"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._version_checked_at < self._version_check_interval:
+                return self._version
+        version = self._version_fn()
+        with self._lock:
+            if version != self._version:
+                # Drop everything computed against an older version
+                self._entries.clear()
+                self._version = version
+            self._version_checked_at = now
+        return version
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing and storing it on a miss"""
+        version = self.current_version()
+        versioned_key = (version, key)
+        with self._lock:
+            if versioned_key in self._entries:
+                self._entries.move_to_end(versioned_key)
+                self.hits += 1
+                metrics.inc("cache_requests_total", cache="dashboard", result="hit")
+                return self._entries[versioned_key]
+            self.misses += 1
+            metrics.inc("cache_requests_total", cache="dashboard", result="miss")
+
+        value = compute()
+        with self._lock:
+            self._entries[versioned_key] = value
+            self._entries.move_to_end(versioned_key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self) -> None:
+        """Clear all entries and force a version re-check"""
+        with self._lock:
+            self._entries.clear()
+            self._version_checked_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,22 @@
+# tests/test_import_budget.py
+"""
+Cold-start import budgets for the CLI subcommands, as checked by
+benchmarks/import_budget.py. Set IMPORT_BUDGET_SCALE to loosen the budgets
+on slower machines.
+"""
+
+import os
+import pytest
+from benchmarks.import_budget import BUDGETS, DEFERRED_MODULES, measure
+
+SCALE = float(os.getenv("IMPORT_BUDGET_SCALE", "1"))
+REPEAT = 3  # The fastest run counts, as in the CLI check
+
+@pytest.mark.parametrize("command_args, budget", BUDGETS, ids=[" ".join(args) for args, _ in BUDGETS])
+def test_import_budget(command_args, budget):
+    runs = [measure(command_args) for _ in range(REPEAT)]
+    seconds = min(run["seconds"] for run in runs)
+    assert seconds <= budget * SCALE, f"{' '.join(command_args)} imported in {seconds:.3f}s, budget {budget * SCALE:.2f}s"
+
+    loaded = [name for name in DEFERRED_MODULES if name in runs[0]["modules"]]
+    assert not loaded, f"{' '.join(command_args)} imports {', '.join(loaded)} up front"